@@ -1,223 +1,95 @@
+import argparse
+import time
+
 import numpy as np
 import random
-from collections import deque
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense
-from tensorflow.keras.optimizers import Adam
-import tensorflow as tf
-
-
-class GameRules:
-    @staticmethod
-    def check_winner(board, marker, empty_marker):
-        rows = [
-            board[0:3], board[3:6], board[6:9],
-            board[0::3], board[1::3], board[2::3],
-            board[0::4], board[2:7:2]
-        ]
-        for row in rows:
-            if row[0] == row[1] == row[2] == marker and row[0] != empty_marker:
-                return True
-        return False
-
-    @staticmethod
-    def is_full(board, empty_marker):
-        return not any(tile == empty_marker for tile in board)
-
-
-class Minimax:
-    def __init__(self):
-        self.AI = [0, 0, 1]
-        self.PLAYER = [0, 1, 0]
-        self.EMPTY = [1, 0, 0]
-
-    def get_scores(self, board):
-        scores = []
-        for i in range(9):
-            if board[i] != self.EMPTY:
-                scores.append(-999)
-            else:
-                board[i] = self.AI
-                score = self._recursive_solve(board, depth=0, is_ai_turn=False)
-                scores.append(score)
-                board[i] = self.EMPTY
-        return scores
-
-    def _recursive_solve(self, board, depth, is_ai_turn):
-        if GameRules.check_winner(board, self.AI, self.EMPTY):
-            return 10 - depth
-        if GameRules.check_winner(board, self.PLAYER, self.EMPTY):
-            return -10 + depth
-        if GameRules.is_full(board, self.EMPTY):
-            return 0
-
-        if is_ai_turn:
-            best_score = -1000
-            for i in range(9):
-                if board[i] == self.EMPTY:
-                    board[i] = self.AI
-                    score = self._recursive_solve(board, depth + 1, False)
-                    board[i] = self.EMPTY
-                    best_score = max(best_score, score)
-            return best_score
-        else:
-            best_score = 1000
-            for i in range(9):
-                if board[i] == self.EMPTY:
-                    board[i] = self.PLAYER
-                    score = self._recursive_solve(board, depth + 1, True)
-                    board[i] = self.EMPTY
-                    best_score = min(best_score, score)
-            return best_score
-
-
-class TicTacToeEnv:
-    def __init__(self):
-        self.AI_MARKER = [0, 0, 1]
-        self.PLAYER_MARKER = [0, 1, 0]
-        self.EMPTY_MARKER = [1, 0, 0]
-
-        self.board = []
-        self.done = False
-        self.difficulty = "minimax"
-
-        self.enemy_brain = Minimax()
-        self.enemy_brain.AI = self.PLAYER_MARKER
-        self.enemy_brain.PLAYER = self.AI_MARKER
-
-        self.reset()
-
-    def reset(self):
-        self.board = [list(self.EMPTY_MARKER) for _ in range(9)]
-        self.done = False
-        return self._get_flat_state()
-
-    def _get_flat_state(self):
-        return np.array(self.board).flatten()
-
-    def step(self, action):
-        if self.board[action] != self.EMPTY_MARKER:
-            return self._get_flat_state(), -10, True
-
-        self.board[action] = list(self.AI_MARKER)
-
-        if GameRules.check_winner(self.board, self.AI_MARKER, self.EMPTY_MARKER):
-            return self._get_flat_state(), 10, True
-
-        if GameRules.is_full(self.board, self.EMPTY_MARKER):
-            return self._get_flat_state(), 0, True
-
-        if self.difficulty == "random":
-            possible_moves = [i for i, x in enumerate(self.board) if x == self.EMPTY_MARKER]
-            if possible_moves:
-                enemy_action = random.choice(possible_moves)
-            else:
-                enemy_action = -1
-        else:
-            scores = self.enemy_brain.get_scores(self.board)
-            enemy_action = np.argmax(scores)
-
-        if enemy_action != -1:
-            self.board[enemy_action] = list(self.PLAYER_MARKER)
-
-        if GameRules.check_winner(self.board, self.PLAYER_MARKER, self.EMPTY_MARKER):
-            return self._get_flat_state(), -10, True
-
-        if GameRules.is_full(self.board, self.EMPTY_MARKER):
-            return self._get_flat_state(), 0, True
-
-        return self._get_flat_state(), 0, False
-
-
-class DQNAgent:
-    def __init__(self, st_size, ac_size):
-        self.state_size = st_size
-        self.action_size = ac_size
-        self.memory = deque(maxlen=2000)
-        self.gamma = 0.95
-        self.epsilon = 1.0
-        self.epsilon_min = 0.01
-        self.epsilon_decay = 0.999
-        self.learning_rate = 0.001
-        self.model = self._build_model()
-
-    def _build_model(self):
-        model = Sequential()
-        model.add(Dense(64, input_dim=self.state_size, activation='relu'))
-        model.add(Dense(64, activation='relu'))
-        model.add(Dense(self.action_size, activation='linear'))
-        model.compile(loss='mse', optimizer=Adam(learning_rate=self.learning_rate))
-        return model
-
-    def act(self, current_state):
-        if np.random.rand() <= self.epsilon:
-            return random.randrange(self.action_size)
-        act_values = self.model.predict(current_state, verbose=0)
-        return np.argmax(act_values[0])
-
-    def remember(self, current_state, action, reward, next_state_val, is_done):
-        self.memory.append((current_state, action, reward, next_state_val, is_done))
-
-    def replay(self, batch_size):
-        if len(self.memory) < batch_size:
-            return
-        minibatch = random.sample(self.memory, batch_size)
 
-        states = np.array([i[0] for i in minibatch])
-        next_states = np.array([i[3] for i in minibatch])
-
-        states = np.squeeze(states)
-        next_states = np.squeeze(next_states)
-
-        targets = self.model.predict(states, verbose=0)
-        next_q_values = self.model.predict(next_states, verbose=0)
-
-        for i, (_, action, reward, _, is_done) in enumerate(minibatch):
-            target = reward
-            if not is_done:
-                target = reward + self.gamma * np.amax(next_q_values[i])
-            targets[i][action] = target
-
-        self.model.fit(states, targets, epochs=1, verbose=0)
-
-        if self.epsilon > self.epsilon_min:
-            self.epsilon *= self.epsilon_decay
-
-    def save_model(self, name):
-        self.model.save(name)
-
-    def load_model(self, name):
-        self.model = tf.keras.models.load_model(name)
-
-
-def main():
-    env = TicTacToeEnv()
-    state_size = 27
-    action_size = 9
-    agent = DQNAgent(state_size, action_size)
-
-    episodes = 5000
-    batch_size = 32
-
-    print("--- Training Start ---")
-
-    for e in range(episodes):
+from actor_learner import ActorLearnerTrainer
+from checkpoint import CHECKPOINT_PATH, load_checkpoint, save_checkpoint
+from numpy_inference import H5_PATH, NPZ_PATH, export_model, model_paths
+from policy_table import build_policy_table
+from training_metrics import ProfileWindow, TrainingMetrics, parse_window
+from tictactoe_core import AI, PLAYER, TicTacToeEnv
+# GameRules y Minimax se definían en este módulo: se reexportan para los imports antiguos
+from tictactoe_core import GameRules, Minimax  # noqa: F401
+
+
+def __getattr__(name):
+    # Los actores de --workers arrancan con spawn, que vuelve a importar este
+    # script: TensorFlow y DQNAgent se cargan solo al usarlos, y se pueden
+    # seguir importando desde aquí
+    if name in ("DQNAgent", "ILLEGAL_Q"):
+        import dqn_agent
+        return getattr(dqn_agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def evaluate_against_minimax(agent, env):
+    """Juega en env (dificultad minimax) una partida codiciosa desde cada apertura.
+
+    La primera jugada de la IA se fuerza a cada casilla y el resto las elige
+    la red sin exploración. Devuelve conteos de victorias, empates y
+    derrotas (una jugada ilegal cuenta como derrota).
+    """
+    env.difficulty = "minimax"
+    results = {"wins": 0, "draws": 0, "losses": 0}
+    for opening in range(env.action_size):
+        env.reset()
+        state, reward, done = env.step(opening)
+        while not done:
+            state, reward, done = env.step(agent.greedy_action(state))
+        results["wins" if reward > 0 else "losses" if reward < 0 else "draws"] += 1
+    return results
+
+
+def train_serial(env, agent, episodes, batch_size, updates_per_episode=1, metrics=None, profiler=None,
+                 target_rate=None, eval_every=50, log_every=10, start_episode=0, checkpoint_every=0,
+                 checkpoint_path=CHECKPOINT_PATH):
+    """Entrena en este proceso y devuelve episodios, pasos de entorno y segundos.
+
+    Con target_rate se evalúa contra Minimax cada eval_every episodios y se
+    para en cuanto la fracción de aperturas sin perder llega a target_rate.
+    Cada evaluación queda en history como (episodios, pasos, segundos,
+    tasa). El tiempo de las evaluaciones no cuenta en seconds. Con
+    checkpoint_every se guarda un checkpoint cada tantos episodios; al
+    reanudar, start_episode es el episodio que devolvió load_checkpoint.
+    """
+    state_size = agent.state_size
+    if metrics is not None:
+        agent.timer = env.timer = metrics.timer
+    eval_env = None
+    if target_rate is not None:
+        eval_env = TicTacToeEnv(env.geometry.n, env.geometry.k, env.enemy_brain.max_depth, batch_dim=True)
+    stats = {"episodes": 0, "env_steps": 0, "seconds": 0.0, "reached": False, "no_loss_rate": None, "history": []}
+    start = time.perf_counter()
+    for e in range(start_episode, episodes):
+        if profiler is not None:
+            profiler.before_episode(e)
         if (e // 20) % 2 == 0:
             env.difficulty = "random"
         else:
             env.difficulty = "minimax"
 
-        if e % 20 == 0:
+        if log_every and e % 20 == 0:
             print(f">>> Cambiando dificultad a: {env.difficulty}")
 
+        # Con batch_dim el entorno ya entrega vistas (1, state_size) sin copiar
         state = env.reset()
-        state = np.reshape(state, [1, state_size])
+        if not env.batch_dim:
+            state = np.reshape(state, [1, state_size])
         total_reward = 0
+        steps = 0
 
-        for _ in range(9):
+        for _ in range(agent.action_size):
             action = agent.act(state)
-            next_state, reward, done = env.step(action)
-            next_state = np.reshape(next_state, [1, state_size])
+            if metrics is None:
+                next_state, reward, done = env.step(action)
+            else:
+                with metrics.timer.phase("env_step"):
+                    next_state, reward, done = env.step(action)
+            if not env.batch_dim:
+                next_state = np.reshape(next_state, [1, state_size])
+            steps += 1
 
             agent.remember(state, action, reward, next_state, done)
             state = next_state
@@ -226,20 +98,210 @@ def main():
                 break
 
         if len(agent.memory) > batch_size:
-            agent.replay(batch_size)
+            agent.replay(batch_size, updates_per_episode)
+
+        if metrics is not None:
+            metrics.end_episode(total_reward, steps, agent.epsilon, agent.last_td_error)
+        stats["episodes"] = e + 1
+        stats["env_steps"] += steps
 
-        if (e + 1) % 10 == 0:
+        if log_every and (e + 1) % log_every == 0:
             print(
                 f"Episodio: {e + 1}/{episodes} ({env.difficulty}), Puntaje: {total_reward}, Epsilon: {agent.epsilon:.2f}")
 
-    print("--- Fin del entrenamiento ---")
+        if eval_env is not None and (e + 1) % eval_every == 0:
+            stats["seconds"] += time.perf_counter() - start
+            results = evaluate_against_minimax(agent, eval_env)
+            start = time.perf_counter()
+            stats["no_loss_rate"] = 1.0 - results["losses"] / env.action_size
+            stats["history"].append((stats["episodes"], stats["env_steps"], stats["seconds"], stats["no_loss_rate"]))
+            if stats["no_loss_rate"] >= target_rate:
+                stats["reached"] = True
+                break
 
-    agent.save_model("tictactoe_ia.h5")
+        if checkpoint_every and (e + 1) % checkpoint_every == 0:
+            save_checkpoint(agent, e + 1, checkpoint_path)
+
+    stats["seconds"] += time.perf_counter() - start
+    if profiler is not None:
+        profiler.stop()
+    return stats
+
+
+def compare_masking(args):
+    """Pasos de entorno y segundos hasta la tasa objetivo, sin y con máscara."""
+    import tensorflow as tf
+    from dqn_agent import DQNAgent
+
+    rows = []
+    for masked in (False, True):
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+        tf.random.set_seed(args.seed)
+        env = TicTacToeEnv(args.size, args.k, batch_dim=True)
+        agent = DQNAgent(env.state_size, env.action_size, memory_size=args.memory_size,
+                         prioritized=args.prioritized, target_update=args.target_update,
+                         double_dqn=args.double_dqn, masked=masked)
+        print(f"--- {'Con' if masked else 'Sin'} máscara de acciones legales ---")
+        stats = train_serial(env, agent, args.episodes, args.batch_size, args.updates_per_episode,
+                             target_rate=args.target_rate, eval_every=args.eval_every, log_every=0)
+        rows.append((masked, stats))
+
+    print(f"\nObjetivo: {args.target_rate:.0%} de aperturas sin perder contra Minimax "
+          f"(evaluación cada {args.eval_every} episodios, semilla {args.seed})")
+    print(f"{'modo':12} {'alcanzado':>9} {'episodios':>9} {'pasos':>8} {'segundos':>9} {'tasa final':>10}")
+    for masked, stats in rows:
+        reached = "sí" if stats["reached"] else "no"
+        rate = f"{stats['no_loss_rate']:.0%}" if stats["no_loss_rate"] is not None else "-"
+        print(f"{'con máscara' if masked else 'sin máscara':12} {reached:>9} {stats['episodes']:9} "
+              f"{stats['env_steps']:8} {stats['seconds']:9.1f} {rate:>10}")
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Entrenamiento DQN de TicTacToe")
+    parser.add_argument("--episodes", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=3, help="lado del tablero (n x n)")
+    parser.add_argument("--k", type=int, default=None, help="fichas en raya para ganar (por defecto el lado)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--updates-per-episode", type=int, default=1,
+                        help="pasos de entrenamiento por episodio jugado")
+    parser.add_argument("--target-update", type=int, default=0,
+                        help="pasos entre copias a la red objetivo; 0 la desactiva")
+    parser.add_argument("--double-dqn", action="store_true",
+                        help="objetivos Double-DQN (la red en línea elige, la objetivo evalúa)")
+    parser.add_argument("--memory-size", type=int, default=2000)
+    parser.add_argument("--prioritized", action="store_true",
+                        help="muestreo prioritizado por error TD en la memoria de repetición")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="procesos actores; 0 entrena en serie en este proceso")
+    parser.add_argument("--sync-interval", type=int, default=10,
+                        help="episodios entre publicaciones de pesos a los actores")
+    parser.add_argument("--queue-depth", type=int, default=64,
+                        help="episodios en vuelo entre actores y aprendiz")
+    parser.add_argument("--metrics-log", default=None,
+                        help="archivo .jsonl o .csv con tiempos por fase y métricas cada --metrics-every episodios")
+    parser.add_argument("--metrics-every", type=int, default=10)
+    parser.add_argument("--profile", type=parse_window, default=None, metavar="INICIO:FIN",
+                        help="cProfile entre esos episodios (guarda training_profile.prof)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="añade tracemalloc a la ventana de --profile")
+    parser.add_argument("--masked", action="store_true",
+                        help="explorar, elegir y calcular objetivos solo sobre casillas libres")
+    parser.add_argument("--target-rate", type=float, default=None,
+                        help="para al llegar a esta fracción de aperturas sin perder contra Minimax")
+    parser.add_argument("--eval-every", type=int, default=50, help="episodios entre evaluaciones de --target-rate")
+    parser.add_argument("--compare-masking", action="store_true",
+                        help="entrena sin y con --masked hasta --target-rate (1.0 por defecto) y compara")
+    parser.add_argument("--seed", type=int, default=0, help="semilla de --compare-masking")
+    parser.add_argument("--distill", action="store_true",
+                        help="en vez de RL, ajusta la red a los puntajes de Minimax en todas las posiciones (3x3)")
+    parser.add_argument("--distill-epochs", type=int, default=3000)
+    parser.add_argument("--distill-batch-size", type=int, default=512)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH,
+                        help="archivo de checkpoint (pesos, optimizador, memoria, epsilon, episodio y generadores)")
+    parser.add_argument("--checkpoint-every", type=int, default=100,
+                        help="episodios entre checkpoints en el entrenamiento en serie; 0 los desactiva")
+    parser.add_argument("--resume", action="store_true", help="continúa desde --checkpoint hasta --episodes")
+    return parser.parse_args(argv)
+
+
+def distill_main(args):
+    import tensorflow as tf
+    from distillation import build_dataset, distill
+    from dqn_agent import DQNAgent
+
+    if args.size != 3 or (args.k or 3) != 3:
+        raise SystemExit("--distill solo está disponible en 3x3")
+    tf.random.set_seed(args.seed)
+    start = time.perf_counter()
+    states, targets, optimal = build_dataset()
+    print(f"Posiciones etiquetadas: {len(states)} en {time.perf_counter() - start:.1f}s")
+
+    agent = DQNAgent(states.shape[1], targets.shape[1])
+    stats = distill(agent.model, states, targets, optimal, args.distill_epochs, args.distill_batch_size,
+                    seed=args.seed)
+    print(f"Destilación: {stats['epochs']} épocas en {stats['seconds']:.1f}s, "
+          f"jugadas óptimas {stats['optimal_rate']:.2%}, resultado conservado {stats['outcome_rate']:.2%}, "
+          f"jugadas ilegales {stats['illegal_moves']}")
+
+    agent.save_model(H5_PATH)
+    export_model(agent.model, NPZ_PATH)
+    # Sin regenerarla, el cliente seguiría jugando la tabla de la red anterior
+    build_policy_table(agent.model)
     print("Modelo guardado.")
 
+
+def main(argv=None):
+    from dqn_agent import DQNAgent
+
+    args = parse_args(argv)
+    if args.distill:
+        distill_main(args)
+        return
+    if args.compare_masking:
+        if args.target_rate is None:
+            args.target_rate = 1.0
+        compare_masking(args)
+        return
+
+    env = TicTacToeEnv(args.size, args.k, batch_dim=True)
+    state_size = env.state_size
+    action_size = env.action_size
+    agent = DQNAgent(state_size, action_size, memory_size=args.memory_size, prioritized=args.prioritized,
+                     target_update=args.target_update, double_dqn=args.double_dqn, masked=args.masked)
+
+    episodes = args.episodes
+    batch_size = args.batch_size
+    start_episode = 0
+    if args.resume:
+        if args.workers > 0:
+            raise SystemExit("--resume solo está disponible en el entrenamiento en serie (--workers 0)")
+        start_episode = load_checkpoint(agent, args.checkpoint)
+
+    metrics = TrainingMetrics(args.metrics_log, args.metrics_every) if args.metrics_log else None
+    profiler = None
+    if args.profile:
+        profiler = ProfileWindow(*args.profile, prefix="training_profile", memory=args.trace_memory)
+
+    print("--- Training Start ---")
+
+    try:
+        if args.workers > 0:
+            trainer = ActorLearnerTrainer(agent, num_workers=args.workers, sync_interval=args.sync_interval,
+                                          queue_depth=args.queue_depth, batch_size=batch_size,
+                                          updates_per_episode=args.updates_per_episode, board_size=args.size,
+                                          k=args.k)
+            stats = trainer.train(episodes, metrics=metrics, profiler=profiler)
+            print(f"Transiciones: {stats['transitions']} en {stats['seconds']:.1f}s "
+                  f"({stats['transitions_per_second']:.1f} transiciones/s)")
+        else:
+            stats = train_serial(env, agent, episodes, batch_size, args.updates_per_episode, metrics, profiler,
+                                 args.target_rate, args.eval_every, start_episode=start_episode,
+                                 checkpoint_every=args.checkpoint_every, checkpoint_path=args.checkpoint)
+            print(f"Pasos de entorno: {stats['env_steps']} en {stats['seconds']:.1f}s")
+            if args.target_rate is not None:
+                status = "alcanzada" if stats["reached"] else "no alcanzada"
+                print(f"Tasa sin perder contra Minimax {args.target_rate:.0%} {status} "
+                      f"en {stats['episodes']} episodios")
+    finally:
+        if metrics is not None:
+            metrics.close()
+            agent.timer = env.timer = None
+
+    print("--- Fin del entrenamiento ---")
+
+    # Junto al script, como la tabla de build_policy_table: así no depende del directorio actual
+    h5_path, npz_path = model_paths(env.geometry)
+    agent.save_model(h5_path)
+    export_model(agent.model, npz_path, masked=agent.masked)
+    if env.geometry.is_standard:
+        # La tabla del cliente tiene prioridad sobre la red: se regenera con los pesos nuevos
+        build_policy_table(agent.model, masked=agent.masked)
+    print(f"Modelo guardado en {npz_path}.")
+
     print("\n--- Juego de demostración ---")
     state = env.reset()
-    state = np.reshape(state, [1, state_size])
     done = False
 
     env.difficulty = "minimax"
@@ -248,24 +310,24 @@ def main():
     steps = 0
     while not done:
         act_values = agent.model.predict(state, verbose=0)
-        action = np.argmax(act_values[0])
+        action = agent.greedy_action(state, act_values[0])
 
         print(f"\nTurno {steps + 1}: IA elige la casilla {action}")
-        next_state, reward, done = env.step(action)
-        state = np.reshape(next_state, [1, state_size])
+        state, reward, done = env.step(action)
 
         visual_board = []
-        for cell in env.board:
-            if cell == env.AI_MARKER:
+        for i in range(env.geometry.cells):
+            cell = env.board.cell(i)
+            if cell == AI:
                 visual_board.append("X")
-            elif cell == env.PLAYER_MARKER:
+            elif cell == PLAYER:
                 visual_board.append("O")
             else:
                 visual_board.append(".")
 
-        print(f"{visual_board[0]} {visual_board[1]} {visual_board[2]}")
-        print(f"{visual_board[3]} {visual_board[4]} {visual_board[5]}")
-        print(f"{visual_board[6]} {visual_board[7]} {visual_board[8]}")
+        n = env.geometry.n
+        for row in range(n):
+            print(" ".join(visual_board[row * n:(row + 1) * n]))
 
         if done:
             if reward == 10:
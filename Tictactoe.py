@@ -1,25 +1,113 @@
+# Referencia para medir el tiempo hasta el primer pintado y hasta tener el
+# modelo listo: se toma antes de cualquier otro import, así que incluye lo
+# que tardan PySide6, NumPy y los módulos del proyecto en cargarse
+import time
+APP_START = time.perf_counter()
+
 import sys
+import argparse
 import os
 import random
 import numpy as np
 import json
-import tensorflow as tf
 from PySide6.QtGui import QFont, QColor, QPainter, QPen, QIcon
 from PySide6.QtMultimedia import QSoundEffect
 from PySide6.QtWidgets import (QApplication, QWidget, QGridLayout, QPushButton, 
                                QMessageBox, QVBoxLayout, QLabel, QStackedWidget, QMainWindow, QGraphicsDropShadowEffect, QHBoxLayout)
-from PySide6.QtCore import Qt, QTimer, QUrl
+from PySide6.QtCore import Qt, QTimer, QUrl, QObject, QThread, Signal, Slot
+
+from anytime_search import ENGINES, make_engine
+from numpy_inference import NumpyPolicy, greedy_actions
+from policy_table import POLICY_PATH, load_current_table
+from retrograde_solver import SolvedTable, solved_path
+from tictactoe_core import AI, PLAYER, STANDARD_GEOMETRY, Board, Minimax, new_board
 
 
 # Cargar el modelo entrenado
 # MODEL_PATH = "tictactoe_ia.h5"
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(BASE_DIR, "tictactoe_ia.h5")
-try:
-    model = tf.keras.models.load_model(MODEL_PATH, compile=False)
-except Exception as e:
-    print(f"Error cargando el modelo: {e}")
-    model = None
+# Pesos exportados con numpy_inference.py: evitan importar TensorFlow en el cliente
+NPZ_MODEL_PATH = os.path.join(BASE_DIR, "tictactoe_ia.npz")
+
+
+def load_model():
+    if os.path.exists(NPZ_MODEL_PATH):
+        return NumpyPolicy.load(NPZ_MODEL_PATH)
+    import tensorflow as tf
+    return tf.keras.models.load_model(MODEL_PATH, compile=False)
+
+
+def load_policy_table():
+    # Jugadas de la red precalculadas con policy_table.py (una consulta por turno);
+    # None si la tabla no corresponde a los pesos actuales de la red
+    return load_current_table(POLICY_PATH, NPZ_MODEL_PATH)
+
+
+# Se cargan en segundo plano (ModelLoader); mientras tanto juega la tabla
+# resuelta si existe, o fallback_solver
+model = None
+policy_table = None
+solved_table = SolvedTable(solved_path(3)) if os.path.exists(solved_path(3)) else None
+fallback_solver = Minimax()
+# Motor de búsqueda con presupuesto de tiempo (--engine); si está, sustituye a la red
+search_engine = None
+
+# Retardo mínimo de "pensando" de la IA (ms); el cálculo corre en otro hilo
+AI_THINKING_DELAY_MS = 500
+
+
+def choose_ai_action(board):
+    # Devuelve la casilla elegida por la red, o -1 si no tiene jugada en la tabla
+    if search_engine is not None:
+        return search_engine.best_move(board, AI)
+    if policy_table is not None:
+        return policy_table.action(board)
+    if model is not None:
+        # Una red entrenada con máscara (masked en el .npz) solo elige casillas libres
+        return int(greedy_actions(model, board.to_onehot().reshape(1, -1))[0])
+    # Modelo aún cargando (o sin modelo): juego perfecto por tabla o Minimax integrado
+    if solved_table is not None:
+        return solved_table.best_move(board, AI)
+    return int(np.argmax(fallback_solver.get_scores(board)))
+
+
+class ModelLoader(QObject):
+    finished = Signal(bool)
+
+    @Slot()
+    def run(self):
+        global model, policy_table
+        try:
+            policy_table = load_policy_table()
+        except Exception as e:
+            print(f"Error cargando la tabla de jugadas: {e}")
+        try:
+            model = load_model()
+        except Exception as e:
+            print(f"Error cargando el modelo: {e}")
+        self.finished.emit(model is not None or policy_table is not None)
+
+
+class AIMoveWorker(QObject):
+    move_ready = Signal(int, int)
+
+    def __init__(self, is_current_request):
+        super().__init__()
+        self.is_current_request = is_current_request
+
+    @Slot(int, int, int)
+    def compute(self, request_id, player_mask, ai_mask):
+        # Peticiones que quedaron obsoletas mientras esperaban en la cola se descartan
+        if not self.is_current_request(request_id):
+            return
+        try:
+            action = choose_ai_action(Board(player_mask, ai_mask))
+        except Exception as e:
+            print(f"Error calculando la jugada de la IA: {e}")
+            action = -1
+        self.move_ready.emit(request_id, action)
+
 
 class NeonButton(QPushButton):
     def __init__(self, text, start_game_callback=None, mode=None):
@@ -60,12 +148,24 @@ class NeonButton(QPushButton):
             self.clicked.connect(lambda: self.start_game_callback(self.mode))
 
 class MainMenu(QWidget):
+    first_paint = Signal()
+
     def __init__(self, start_game_callback):
         super().__init__()
         self.start_game_callback = start_game_callback
+        self.painted = False
         self.init_ui()
+
+    def set_ai_status(self, text, color):
+        self.ai_status_label.setText(text)
+        self.ai_status_label.setStyleSheet(f"color: {color}; letter-spacing: 2px;")
     
     def paintEvent(self, event):
+        if not self.painted:
+            self.painted = True
+            print(f"Primer pintado: {(time.perf_counter() - APP_START) * 1000:.0f} ms desde el inicio del módulo")
+            QTimer.singleShot(0, self.first_paint.emit)
+
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
@@ -129,6 +229,14 @@ class MainMenu(QWidget):
         title.setGraphicsEffect(title_glow)
         
         layout.addWidget(title)
+
+        # Estado de la carga del modelo
+        self.ai_status_label = QLabel("")
+        self.ai_status_label.setAlignment(Qt.AlignCenter)
+        self.ai_status_label.setFont(QFont("Arial", 12, QFont.Bold))
+        self.set_ai_status("IA: CARGANDO...", "#FFD400")
+        layout.addWidget(self.ai_status_label)
+
         layout.addSpacing(30)
 
         # Botones
@@ -235,7 +343,9 @@ class NeonScoreLabel(QLabel):
         self.setGraphicsEffect(glow)
 
 class TicTacToeGame(QWidget):
-    def __init__(self, back_to_menu_callback):
+    ai_move_requested = Signal(int, int, int)
+
+    def __init__(self, back_to_menu_callback, ai_delay_ms=AI_THINKING_DELAY_MS):
         super().__init__()
 
         self.phrase_generator = AIPhraseGenerator()
@@ -308,11 +418,11 @@ class TicTacToeGame(QWidget):
         self.layout.addSpacing(10) 
 
         self.buttons = []
-        self.AI_MARKER = [0, 0, 1]
-        self.PLAYER_MARKER = [0, 1, 0]
-        self.PLAYER2_MARKER = [0, 0, 1] 
-        self.EMPTY_MARKER = [1, 0, 0]
-        self.state_size = 27
+        self.AI_MARKER = AI
+        self.PLAYER_MARKER = PLAYER
+        self.PLAYER2_MARKER = AI
+        self.geometry = STANDARD_GEOMETRY
+        self.state_size = self.geometry.state_size
         
         self.game_mode = "ai" 
         self.current_player_symbol = "O" 
@@ -347,6 +457,23 @@ class TicTacToeGame(QWidget):
         self.init_board_ui()
         self.overlay = GameOverOverlay(self)
 
+        # Hilo de cálculo de la IA: cada petición lleva un id y solo se aplica la más reciente
+        self.ai_delay_ms = ai_delay_ms
+        self.ai_request_id = 0
+        self.ai_request_started = 0.0
+        self.ai_thread = QThread(self)
+        self.ai_worker = AIMoveWorker(lambda request_id: request_id == self.ai_request_id)
+        self.ai_worker.moveToThread(self.ai_thread)
+        self.ai_move_requested.connect(self.ai_worker.compute)
+        self.ai_worker.move_ready.connect(self.on_ai_move_ready)
+        self.ai_thread.start()
+        QApplication.instance().aboutToQuit.connect(self.stop_ai_thread)
+
+    def stop_ai_thread(self):
+        self.cancel_ai_move()
+        self.ai_thread.quit()
+        self.ai_thread.wait()
+
     def resizeEvent(self, event):
         # El overlay siempre debe tener el mismo tamaño que el juego
         self.overlay.resize(self.size())
@@ -375,9 +502,10 @@ class TicTacToeGame(QWidget):
 
     def init_board_ui(self):
         self.buttons = []
-        for i in range(9):
+        n = self.geometry.n
+        for i in range(self.geometry.cells):
             btn = NeonCell(i, self.handle_click)
-            self.grid_layout.addWidget(btn, i // 3, i % 3)
+            self.grid_layout.addWidget(btn, i // n, i % n)
             self.buttons.append(btn)
 
     def start_game(self, mode=None):
@@ -391,7 +519,7 @@ class TicTacToeGame(QWidget):
         if self.game_mode == "ai":
             self.turn = random.choice(["user", "ai"])
             if self.turn == "ai":
-                QTimer.singleShot(500, self.ai_move) 
+                self.request_ai_move()
             else:
                  self.status_label.setText("Turno: Jugador")
                  self.status_label.setStyleSheet(f"color: {self.color_o}; letter-spacing: 2px;")
@@ -401,7 +529,8 @@ class TicTacToeGame(QWidget):
             self.status_label.setStyleSheet(f"color: {self.color_o}; letter-spacing: 2px;") 
 
     def reset_board(self):
-        self.board = [list(self.EMPTY_MARKER) for _ in range(9)]
+        self.cancel_ai_move()
+        self.board = new_board(self.geometry)
         self.game_over = False
         self.status_label.setText("") # Limpiar estado
         self.overlay.hide()
@@ -411,7 +540,7 @@ class TicTacToeGame(QWidget):
         if self.game_over:
             return
 
-        if self.board[idx] != self.EMPTY_MARKER:
+        if not self.board.is_empty(idx):
             return
 
         # Determinar marcador actual basado en el turno
@@ -425,7 +554,7 @@ class TicTacToeGame(QWidget):
         self.click_sound.play()
 
         # Realizar movimiento
-        self.board[idx] = list(current_marker)
+        self.board.place(idx, current_marker)
         self.update_ui()
 
         if self.check_winner(current_marker):
@@ -444,7 +573,7 @@ class TicTacToeGame(QWidget):
             self.turn = "ai"
             self.status_label.setText("Turno: IA")
             self.status_label.setStyleSheet(f"color: {self.color_x}; letter-spacing: 2px;") 
-            QTimer.singleShot(500, self.ai_move) 
+            self.request_ai_move()
         elif self.game_mode == "pvp":
             self.turn = "player2" if self.turn == "player1" else "player1"
             is_p2 = (self.turn == "player2")
@@ -453,24 +582,38 @@ class TicTacToeGame(QWidget):
             self.status_label.setText(f"Turno: {turn_name}")
             self.status_label.setStyleSheet(f"color: {color}; letter-spacing: 2px;")
 
-    def ai_move(self):
-        if self.game_over or not model or self.turn != "ai":
+    def cancel_ai_move(self):
+        # Invalida cualquier cálculo en curso; su resultado se ignorará al llegar
+        self.ai_request_id += 1
+
+    def request_ai_move(self):
+        if self.game_over or self.turn != "ai":
             return
-            
-        state = np.array(self.board).flatten().reshape(1, self.state_size)
-        act_values = model.predict(state, verbose=0)
-        action = np.argmax(act_values[0])
-        
-        # Si está ocupado, encontrar el siguiente libre
-        if self.board[action] != self.EMPTY_MARKER:
-            free = [i for i, v in enumerate(self.board) if v == self.EMPTY_MARKER]
+        self.ai_request_id += 1
+        self.ai_request_started = time.perf_counter()
+        self.ai_move_requested.emit(self.ai_request_id, self.board.player, self.board.ai)
+
+    def on_ai_move_ready(self, request_id, action):
+        if request_id != self.ai_request_id:
+            return
+        elapsed_ms = (time.perf_counter() - self.ai_request_started) * 1000
+        remaining_ms = max(0, int(self.ai_delay_ms - elapsed_ms))
+        QTimer.singleShot(remaining_ms, lambda: self.ai_move(request_id, action))
+
+    def ai_move(self, request_id, action):
+        if request_id != self.ai_request_id or self.game_over or self.turn != "ai":
+            return
+
+        # Si está ocupado (o la tabla no tiene jugada), encontrar el siguiente libre
+        if action < 0 or not self.board.is_empty(action):
+            free = self.board.legal_moves()
             if free:
                 action = random.choice(free)
             else:
                 self.end_game("Empate")
                 return
 
-        self.board[action] = list(self.AI_MARKER)
+        self.board.place(action, self.AI_MARKER)
         self.update_ui()
         
         if self.check_winner(self.AI_MARKER):
@@ -487,27 +630,19 @@ class TicTacToeGame(QWidget):
 
     def update_ui(self):
         for i, btn in enumerate(self.buttons):
-            if self.board[i] == self.AI_MARKER:
+            cell = self.board.cell(i)
+            if cell == self.AI_MARKER:
                 btn.set_marker("X") 
-            elif self.board[i] == self.PLAYER_MARKER:
+            elif cell == self.PLAYER_MARKER:
                 btn.set_marker("O") 
             else:
                 btn.set_marker("")
 
     def check_winner(self, marker):
-        b = self.board
-        win_patterns = [
-            [0,1,2],[3,4,5],[6,7,8], # filas
-            [0,3,6],[1,4,7],[2,5,8], # columnas
-            [0,4,8],[2,4,6]          # diagonales
-        ]
-        for pattern in win_patterns:
-            if all(b[i] == marker for i in pattern):
-                return True
-        return False
+        return self.board.has_won(marker)
 
     def is_full(self):
-        return all(cell != self.EMPTY_MARKER for cell in self.board)
+        return self.board.is_full()
 
     def end_game(self, winner):
         self.game_over = True
@@ -620,9 +755,30 @@ class MainWindow(QMainWindow):
         self.stacked_widget.addWidget(self.game_widget)
         
         self.show_menu()
+
+        # El modelo se carga en otro hilo después del primer pintado del menú
+        self.model_thread = QThread(self)
+        self.model_loader = ModelLoader()
+        self.model_loader.moveToThread(self.model_thread)
+        self.model_thread.started.connect(self.model_loader.run)
+        self.model_loader.finished.connect(self.on_model_loaded)
+        self.model_loader.finished.connect(self.model_thread.quit)
+        self.main_menu.first_paint.connect(self.model_thread.start)
         
         # Lógica de arrastre de ventana
 
+    def on_model_loaded(self, ok):
+        print(f"Modelo listo: {(time.perf_counter() - APP_START) * 1000:.0f} ms desde el inicio del módulo")
+        if ok:
+            self.main_menu.set_ai_status("IA: LISTA", "#00FF99")
+        else:
+            self.main_menu.set_ai_status("IA: MODO MINIMAX", "#FF0064")
+
+    def closeEvent(self, event):
+        self.model_thread.quit()
+        self.model_thread.wait()
+        super().closeEvent(event)
+
     def show_menu(self):
         self.stacked_widget.setCurrentWidget(self.main_menu)
 
@@ -707,8 +863,21 @@ class GameOverOverlay(QWidget):
         self.show()
         self.raise_()
 
+def parse_args(argv):
+    # Argumentos propios; el resto se pasa a Qt
+    parser = argparse.ArgumentParser(description="TicTacToe con IA")
+    parser.add_argument("--engine", choices=("model",) + ENGINES, default="model",
+                        help="IA del modo contra la máquina")
+    parser.add_argument("--budget-ms", type=float, default=200, help="tiempo máximo por jugada del motor")
+    parser.add_argument("--playouts", type=int, default=None, help="límite de simulaciones de MCTS")
+    return parser.parse_known_args(argv[1:])
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv)
+    if args.engine != "model":
+        search_engine = make_engine(args.engine, STANDARD_GEOMETRY, args.budget_ms, args.playouts)
+    app = QApplication(sys.argv[:1] + qt_args)
     window = MainWindow()
     window.show()
     window.raise_()
@@ -0,0 +1,181 @@
+import multiprocessing as mp
+import random
+import time
+
+import numpy as np
+
+from numpy_inference import mlp_forward
+from tictactoe_core import EMPTY, TicTacToeEnv
+
+
+def flatten_weights(weights):
+    return np.concatenate([np.asarray(w, dtype=np.float32).ravel() for w in weights])
+
+
+def unflatten_weights(flat, shapes):
+    weights = []
+    offset = 0
+    for shape in shapes:
+        size = int(np.prod(shape))
+        weights.append(flat[offset:offset + size].reshape(shape))
+        offset += size
+    return weights
+
+
+def _actor_loop(worker_id, episodes, shapes, weights_buffer, weights_version, epsilon_value,
+                transitions, stop_event, seed, board_size=3, k=None, masked=False):
+    random.seed(seed)
+    np.random.seed(seed)
+    env = TicTacToeEnv(board_size, k)
+    weights = None
+    version = -1
+
+    for e in range(episodes):
+        if stop_event.is_set():
+            break
+
+        if weights_version.value != version:
+            with weights_buffer.get_lock():
+                version = weights_version.value
+                flat = np.frombuffer(weights_buffer.get_obj(), dtype=np.float32).copy()
+            weights = unflatten_weights(flat, shapes)
+        epsilon = epsilon_value.value
+
+        env.difficulty = "random" if (e // 20) % 2 == 0 else "minimax"
+        # Las observaciones del entorno son vistas que se reutilizan: se copian
+        # directamente en un arreglo propio del episodio, que viaja por la cola
+        states = np.empty((env.action_size + 1, env.state_size), dtype=np.float32)
+        env.reset(out=states[0])
+        episode = []
+        for t in range(env.action_size):
+            # Con masked solo se consideran las casillas libres (canal vacío de la observación)
+            legal = np.flatnonzero(states[t, EMPTY::3]) if masked else None
+            if random.random() <= epsilon:
+                action = random.randrange(env.action_size) if legal is None else int(random.choice(legal))
+            else:
+                q_values = mlp_forward(weights, states[t])
+                action = int(np.argmax(q_values)) if legal is None else int(legal[np.argmax(q_values[legal])])
+            _, reward, done = env.step(action, out=states[t + 1])
+            episode.append((states[t], action, reward, states[t + 1], done))
+            if done:
+                break
+
+        transitions.put((worker_id, env.difficulty, episode))
+
+    transitions.put((worker_id, None, None))
+
+
+class ActorLearnerTrainer:
+    """Entrenamiento con varios procesos actores y un único aprendiz.
+
+    Cada actor juega episodios de TicTacToeEnv con una copia en NumPy de la
+    red y envía las transiciones por una cola acotada. El aprendiz (dueño del
+    DQNAgent) las guarda en memoria, llama a replay una vez por episodio
+    recibido y publica pesos y epsilon cada sync_interval episodios.
+    """
+
+    def __init__(self, agent, num_workers=4, sync_interval=10, queue_depth=64, batch_size=32,
+                 updates_per_episode=1, seed=None, board_size=3, k=None):
+        self.agent = agent
+        self.num_workers = num_workers
+        self.sync_interval = sync_interval
+        self.queue_depth = queue_depth
+        self.batch_size = batch_size
+        self.updates_per_episode = updates_per_episode
+        self.seed = seed if seed is not None else random.randrange(1 << 30)
+        self.board_size = board_size
+        self.k = k
+
+        self.episodes_done = 0
+        self.transitions_done = 0
+        self.elapsed = 0.0
+
+    def _publish(self, weights_buffer, weights_version, epsilon_value):
+        flat = flatten_weights(self.agent.model.get_weights())
+        with weights_buffer.get_lock():
+            np.frombuffer(weights_buffer.get_obj(), dtype=np.float32)[:] = flat
+            weights_version.value += 1
+        epsilon_value.value = self.agent.epsilon
+
+    def train(self, episodes, log_every=10, metrics=None, profiler=None):
+        # metrics solo mide el aprendiz (sample, target, fit); act y env_step ocurren en los actores
+        if metrics is not None:
+            self.agent.timer = metrics.timer
+        ctx = mp.get_context("spawn")
+        weights = self.agent.model.get_weights()
+        shapes = [w.shape for w in weights]
+
+        weights_buffer = ctx.Array("f", int(sum(w.size for w in weights)))
+        weights_version = ctx.Value("i", -1)
+        epsilon_value = ctx.Value("d", self.agent.epsilon)
+        transitions = ctx.Queue(maxsize=self.queue_depth)
+        stop_event = ctx.Event()
+        self._publish(weights_buffer, weights_version, epsilon_value)
+
+        per_worker = [episodes // self.num_workers + (i < episodes % self.num_workers)
+                      for i in range(self.num_workers)]
+        workers = [
+            ctx.Process(
+                target=_actor_loop,
+                args=(i, per_worker[i], shapes, weights_buffer, weights_version, epsilon_value,
+                      transitions, stop_event, self.seed + i, self.board_size, self.k,
+                      self.agent.masked),
+                daemon=True
+            )
+            for i in range(self.num_workers)
+        ]
+
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+
+        try:
+            finished = 0
+            while finished < self.num_workers:
+                worker_id, difficulty, episode = transitions.get()
+                if episode is None:
+                    finished += 1
+                    continue
+                if profiler is not None:
+                    profiler.before_episode(self.episodes_done)
+
+                total_reward = 0
+                for state, action, reward, next_state, done in episode:
+                    self.agent.remember(np.reshape(state, [1, self.agent.state_size]), action, reward,
+                                        np.reshape(next_state, [1, self.agent.state_size]), done)
+                    total_reward += reward
+                self.transitions_done += len(episode)
+                self.episodes_done += 1
+
+                if len(self.agent.memory) > self.batch_size:
+                    self.agent.replay(self.batch_size, self.updates_per_episode)
+                if metrics is not None:
+                    metrics.end_episode(total_reward, len(episode), self.agent.epsilon, self.agent.last_td_error)
+
+                if self.episodes_done % self.sync_interval == 0:
+                    self._publish(weights_buffer, weights_version, epsilon_value)
+
+                if self.episodes_done % log_every == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"Episodio: {self.episodes_done}/{episodes} (actor {worker_id}, {difficulty}), "
+                          f"Puntaje: {total_reward}, Epsilon: {self.agent.epsilon:.2f}, "
+                          f"Transiciones/s: {self.transitions_done / elapsed:.1f}")
+        finally:
+            if profiler is not None:
+                profiler.stop()
+            stop_event.set()
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+
+        self.elapsed = time.perf_counter() - start
+        return self.throughput()
+
+    def throughput(self):
+        return {
+            "episodes": self.episodes_done,
+            "transitions": self.transitions_done,
+            "seconds": self.elapsed,
+            "transitions_per_second": self.transitions_done / self.elapsed if self.elapsed else 0.0
+        }
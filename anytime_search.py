@@ -0,0 +1,297 @@
+import argparse
+import math
+import random
+import time
+
+from tictactoe_core import AI, PLAYER, STANDARD_GEOMETRY, Geometry, GridBoard, iter_bits
+
+WIN_SCORE = 1_000_000
+ENGINES = ("iterative", "mcts")
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def _neighbor_masks(geometry):
+    # Casillas a distancia 1 (rey de ajedrez) de cada casilla
+    n = geometry.n
+    masks = []
+    for cell in range(geometry.cells):
+        row, col = divmod(cell, n)
+        mask = 0
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                r, c = row + d_row, col + d_col
+                if (d_row or d_col) and 0 <= r < n and 0 <= c < n:
+                    mask |= 1 << (r * n + c)
+        masks.append(mask)
+    return tuple(masks)
+
+
+def _candidates(geometry, neighbors, mine, theirs):
+    """Casillas libres (junto a alguna ficha si hay neighbors) en el orden de geometry.move_order."""
+    occupied = mine | theirs
+    if neighbors is None:
+        return [i for i in geometry.move_order if not occupied >> i & 1]
+    if not occupied:
+        return [geometry.move_order[0]]
+    near = 0
+    for cell in iter_bits(occupied):
+        near |= neighbors[cell]
+    near &= geometry.full_mask & ~occupied
+    return [i for i in geometry.move_order if near >> i & 1]
+
+
+def _masks(board, channel):
+    other = PLAYER if channel == AI else AI
+    return board.mask(channel), board.mask(other)
+
+
+class IterativeDeepeningSearch:
+    """Alfa-beta (negamax) con profundización iterativa y presupuesto de tiempo.
+
+    Cada iteración busca un nivel más que la anterior, probando primero la
+    mejor jugada encontrada. Si se agota time_budget_ms a mitad de una
+    iteración, se descarta y se juega la mejor de la última completa, así
+    que siempre hay respuesta. En las hojas se usa una heurística: cada
+    línea aún libre del rival suma 4^fichas propias, y resta lo mismo a la
+    inversa. En tableros de más de 4x4 solo se consideran casillas junto a
+    fichas ya colocadas.
+    """
+
+    def __init__(self, geometry=None, time_budget_ms=100, max_depth=None):
+        self.geometry = geometry or STANDARD_GEOMETRY
+        self.time_budget = time_budget_ms / 1000.0
+        self.max_depth = max_depth or self.geometry.cells
+        self.neighbors = _neighbor_masks(self.geometry) if self.geometry.n > 4 else None
+        self.weights = tuple(4 ** count if count else 0 for count in range(self.geometry.k + 1))
+
+        self.nodes = 0
+        self.deadline = 0.0
+        self.last_stats = None
+
+    def evaluate(self, mine, theirs):
+        score = 0
+        weights = self.weights
+        for line in self.geometry.line_masks:
+            if not line & theirs:
+                score += weights[(line & mine).bit_count()]
+            elif not line & mine:
+                score -= weights[(line & theirs).bit_count()]
+        return score
+
+    def best_move(self, board, channel=AI):
+        mine, theirs = _masks(board, channel)
+        start = time.perf_counter()
+        self.deadline = start + self.time_budget
+        self.nodes = 0
+
+        moves = _candidates(self.geometry, self.neighbors, mine, theirs)
+        best, best_score, depth_done = moves[0], None, 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._root(mine, theirs, moves, depth)
+            except SearchTimeout:
+                break
+            best, best_score, depth_done = move, score, depth
+            moves.remove(move)
+            moves.insert(0, move)
+            # Resultado forzado o árbol completo: más profundidad no cambia nada
+            remaining = self.geometry.cells - (mine | theirs).bit_count()
+            if abs(score) >= WIN_SCORE - self.geometry.cells or depth >= remaining:
+                break
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            "engine": "iterative",
+            "depth": depth_done,
+            "score": best_score,
+            "nodes": self.nodes,
+            "time": elapsed,
+            "nodes_per_second": self.nodes / elapsed if elapsed else 0.0
+        }
+        return best
+
+    def _root(self, mine, theirs, moves, depth):
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_move, best_score = moves[0], -WIN_SCORE - 1
+        for move in moves:
+            score = -self._negamax(theirs, mine | 1 << move, move, 1, depth - 1, -beta, -alpha)
+            if score > best_score:
+                best_move, best_score = move, score
+            alpha = max(alpha, score)
+        return best_score, best_move
+
+    def _negamax(self, mine, theirs, last, ply, depth, alpha, beta):
+        # theirs acaba de jugar en last; solo sus líneas por last pueden ganar
+        self.nodes += 1
+        if not self.nodes & 63 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        geometry = self.geometry
+        if geometry.wins_at(theirs, last):
+            return -WIN_SCORE + ply
+        if (mine | theirs) == geometry.full_mask:
+            return 0
+        if depth == 0:
+            return self.evaluate(mine, theirs)
+
+        best_score = -WIN_SCORE - 1
+        for move in _candidates(geometry, self.neighbors, mine, theirs):
+            score = -self._negamax(theirs, mine | 1 << move, move, ply + 1, depth - 1, -beta, -alpha)
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        return best_score
+
+
+class _Node:
+    __slots__ = ("move", "mover", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, mover, parent, untried):
+        self.move = move
+        self.mover = mover
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+
+class MonteCarloTreeSearch:
+    """UCT con partidas aleatorias hasta el final.
+
+    Se detiene al llegar a playouts simulaciones o a time_budget_ms, lo que
+    ocurra antes (cualquiera de los dos puede ser None), y juega la jugada
+    más visitada. Cada nodo acumula victorias del bando (0 = el que mueve en
+    la raíz, 1 = el rival) que hizo la jugada que lleva a él.
+    """
+
+    def __init__(self, geometry=None, playouts=1000, time_budget_ms=None, exploration=1.4, seed=None):
+        if playouts is None and time_budget_ms is None:
+            raise ValueError("MCTS necesita playouts o time_budget_ms")
+        self.geometry = geometry or STANDARD_GEOMETRY
+        self.playouts = playouts
+        self.time_budget = time_budget_ms / 1000.0 if time_budget_ms is not None else None
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.last_stats = None
+
+    def best_move(self, board, channel=AI):
+        geometry = self.geometry
+        root_masks = _masks(board, channel)
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget is not None else math.inf
+        root = _Node(-1, 1, None, list(iter_bits(geometry.full_mask & ~(root_masks[0] | root_masks[1]))))
+        nodes = 1
+        playouts = 0
+
+        while (self.playouts is None or playouts < self.playouts) and time.perf_counter() < deadline:
+            masks = list(root_masks)
+            node, winner = root, None
+            # Selección
+            while not node.untried and node.children:
+                node = self._select(node)
+                masks[node.mover] |= 1 << node.move
+                if geometry.wins_at(masks[node.mover], node.move):
+                    winner = node.mover
+                    break
+            # Expansión
+            if winner is None and node.untried:
+                move = node.untried.pop(self.rng.randrange(len(node.untried)))
+                mover = node.mover ^ 1
+                masks[mover] |= 1 << move
+                won = geometry.wins_at(masks[mover], move)
+                untried = [] if won else list(iter_bits(geometry.full_mask & ~(masks[0] | masks[1])))
+                child = _Node(move, mover, node, untried)
+                node.children.append(child)
+                node = child
+                nodes += 1
+                if won:
+                    winner = mover
+            # Simulación desde el turno del bando que no jugó node
+            if winner is None:
+                winner = self._playout(masks, node.mover ^ 1)
+            # Retropropagación
+            while node is not None:
+                node.visits += 1
+                if winner == node.mover:
+                    node.wins += 1.0
+                elif winner < 0:
+                    node.wins += 0.5
+                node = node.parent
+            playouts += 1
+
+        elapsed = time.perf_counter() - start
+        best = max(root.children, key=lambda c: c.visits).move if root.children else root.untried[0]
+        self.last_stats = {
+            "engine": "mcts",
+            "playouts": playouts,
+            "nodes": nodes,
+            "time": elapsed,
+            "playouts_per_second": playouts / elapsed if elapsed else 0.0,
+            "nodes_per_second": nodes / elapsed if elapsed else 0.0
+        }
+        return best
+
+    def _select(self, node):
+        log_visits = math.log(node.visits)
+        c = self.exploration
+        return max(node.children,
+                   key=lambda child: child.wins / child.visits + c * math.sqrt(log_visits / child.visits))
+
+    def _playout(self, masks, side):
+        # Devuelve el bando ganador o -1 si termina en tablas
+        geometry = self.geometry
+        masks = list(masks)
+        free = list(iter_bits(geometry.full_mask & ~(masks[0] | masks[1])))
+        self.rng.shuffle(free)
+        for move in free:
+            masks[side] |= 1 << move
+            if geometry.wins_at(masks[side], move):
+                return side
+            side ^= 1
+        return -1
+
+
+def make_engine(name, geometry=None, time_budget_ms=100, playouts=None, seed=None):
+    """Motor por nombre; ambos exponen best_move(board, channel) y last_stats."""
+    if name == "iterative":
+        return IterativeDeepeningSearch(geometry, time_budget_ms)
+    if name == "mcts":
+        return MonteCarloTreeSearch(geometry, playouts, time_budget_ms, seed=seed)
+    raise ValueError(f"Motor desconocido: {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Motores con presupuesto de tiempo para tableros grandes")
+    parser.add_argument("--size", type=int, default=7)
+    parser.add_argument("--k", type=int, default=None)
+    parser.add_argument("--budget-ms", type=float, default=200)
+    parser.add_argument("--playouts", type=int, default=None, help="límite de simulaciones de MCTS")
+    parser.add_argument("--moves", type=int, default=10, help="jugadas por motor en la partida de prueba")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    geometry = Geometry(args.size, args.k)
+    for name in ENGINES:
+        engine = make_engine(name, geometry, args.budget_ms, args.playouts, args.seed)
+        board = GridBoard(geometry)
+        channel, worst = AI, 0.0
+        for _ in range(args.moves):
+            if board.winner is not None or board.is_full():
+                break
+            board.place(engine.best_move(board, channel), channel)
+            stats = engine.last_stats
+            worst = max(worst, stats["time"])
+            channel = PLAYER if channel == AI else AI
+        extra = f"profundidad {stats['depth']}" if name == "iterative" else f"{stats['playouts']} simulaciones"
+        print(f"{name:>9}: {stats['nodes_per_second']:,.0f} nodos/s, {extra} en la última jugada, "
+              f"latencia máxima {worst * 1000:.1f} ms (presupuesto {args.budget_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from numpy_inference import NPZ_PATH, NumpyPolicy, greedy_actions
+from tictactoe_core import BITS, FULL_MASK, Board, Minimax, onehot_batch
+from tictactoe_vec_env import WIN_ARRAY
+
+AGENTS = ("dqn", "minimax", "random")
+
+
+class RandomPlayer:
+    def act(self, mine, theirs, rng):
+        weights = rng.random((len(mine), 9))
+        weights[BITS[mine | theirs] == 1] = -1.0
+        return np.argmax(weights, axis=1)
+
+
+class MinimaxPlayer:
+    """Minimax con caché de la jugada por posición (np.argmax de get_scores)."""
+
+    def __init__(self):
+        self.solver = Minimax()
+        self.moves = {}
+
+    def act(self, mine, theirs, rng):
+        actions = np.empty(len(mine), dtype=np.int64)
+        for k, key in enumerate(zip(mine.tolist(), theirs.tolist())):
+            action = self.moves.get(key)
+            if action is None:
+                # La IA del solver (canal AI) es siempre el jugador que mueve
+                action = int(np.argmax(self.solver.get_scores(Board(key[1], key[0]))))
+                self.moves[key] = action
+            actions[k] = action
+        return actions
+
+
+class DQNPlayer:
+    """Red entrenada evaluada en lote sobre todas las partidas en curso.
+
+    El tablero se codifica desde el punto de vista del que mueve: sus fichas
+    en el canal de la IA y las del rival en el del jugador.
+    """
+
+    def __init__(self, npz_path):
+        self.policy = NumpyPolicy.load(npz_path)
+
+    def act(self, mine, theirs, rng):
+        return greedy_actions(self.policy, onehot_batch(mine, theirs))
+
+
+def make_player(name, npz_path):
+    if name == "dqn":
+        return DQNPlayer(npz_path)
+    if name == "minimax":
+        return MinimaxPlayer()
+    return RandomPlayer()
+
+
+def play_batch(first, second, games, seed, npz_path=NPZ_PATH, illegal="forfeit"):
+    """Juega games partidas a la vez; devuelve los conteos desde el primer jugador.
+
+    Con illegal="forfeit" una jugada en casilla ocupada pierde la partida (como
+    el -10 de TicTacToeEnv); con "random" se sustituye por una casilla libre
+    al azar (como el cliente Qt). En ambos casos se cuenta.
+    """
+    rng = np.random.default_rng(seed)
+    players = (make_player(first, npz_path), make_player(second, npz_path))
+    masks = (np.zeros(games, dtype=np.int64), np.zeros(games, dtype=np.int64))
+    result = np.full(games, 2, dtype=np.int64)  # 0 gana primero, 1 gana segundo, 2 empate
+    active = np.ones(games, dtype=bool)
+    illegal_moves = [0, 0]
+
+    for ply in range(9):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+        side = ply % 2
+        mine, theirs = masks[side][idx], masks[1 - side][idx]
+        actions = players[side].act(mine, theirs, rng)
+
+        bad = ((mine | theirs) >> actions) & 1 == 1
+        if bad.any():
+            illegal_moves[side] += int(bad.sum())
+            if illegal == "forfeit":
+                result[idx[bad]] = 1 - side
+                active[idx[bad]] = False
+                idx, mine, theirs, actions = idx[~bad], mine[~bad], theirs[~bad], actions[~bad]
+            else:
+                actions[bad] = RandomPlayer().act(mine[bad], theirs[bad], rng)
+
+        mine = mine | np.left_shift(1, actions)
+        masks[side][idx] = mine
+        won = WIN_ARRAY[mine]
+        result[idx[won]] = side
+        finished = won | ((mine | theirs) == FULL_MASK)
+        active[idx[finished]] = False
+
+    return {
+        "first_wins": int(np.sum(result == 0)),
+        "second_wins": int(np.sum(result == 1)),
+        "draws": int(np.sum(result == 2)),
+        "illegal_first": illegal_moves[0],
+        "illegal_second": illegal_moves[1]
+    }
+
+
+def wilson_interval(successes, total, z=1.96):
+    if total == 0:
+        return 0.0, 0.0
+    p = successes / total
+    denominator = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return center - margin, center + margin
+
+
+def run_arena(games, workers=None, chunk=2000, agents=AGENTS, npz_path=NPZ_PATH, illegal="forfeit", seed=0):
+    pairings = list(itertools.product(agents, repeat=2))
+    tasks = []
+    for first, second in pairings:
+        for start in range(0, games, chunk):
+            tasks.append((first, second, min(chunk, games - start), seed + len(tasks)))
+
+    totals = {pair: dict.fromkeys(("first_wins", "second_wins", "draws", "illegal_first", "illegal_second"), 0)
+              for pair in pairings}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(task[:2], pool.submit(play_batch, *task, npz_path, illegal)) for task in tasks]
+        for pair, future in futures:
+            for key, value in future.result().items():
+                totals[pair][key] += value
+    elapsed = time.perf_counter() - started
+
+    report = {"games": games * len(pairings), "seconds": elapsed,
+              "games_per_second": games * len(pairings) / elapsed, "pairings": []}
+    for (first, second), counts in totals.items():
+        entry = {"first": first, "second": second, "games": games, **counts}
+        for name, key in (("win", "first_wins"), ("draw", "draws"), ("loss", "second_wins")):
+            entry[f"{name}_rate"] = counts[key] / games
+            entry[f"{name}_ci95"] = wilson_interval(counts[key], games)
+        report["pairings"].append(entry)
+    return report
+
+
+def print_report(report):
+    print(f"{'primero':>8} {'segundo':>8} {'victoria':>22} {'empate':>22} {'derrota':>22} {'ilegales':>12}")
+    for entry in report["pairings"]:
+        cells = []
+        for name in ("win", "draw", "loss"):
+            low, high = entry[f"{name}_ci95"]
+            cells.append(f"{entry[f'{name}_rate'] * 100:6.2f}% [{low * 100:5.1f},{high * 100:5.1f}]")
+        illegal = f"{entry['illegal_first']}/{entry['illegal_second']}"
+        print(f"{entry['first']:>8} {entry['second']:>8} {cells[0]:>22} {cells[1]:>22} {cells[2]:>22} {illegal:>12}")
+    print(f"\n{report['games']} partidas en {report['seconds']:.2f}s ({report['games_per_second']:.0f} partidas/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Torneo DQN vs Minimax vs Random en paralelo")
+    parser.add_argument("--games", type=int, default=10000, help="partidas por emparejamiento")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=2000, help="partidas por tarea del pool")
+    parser.add_argument("--npz", default=NPZ_PATH)
+    parser.add_argument("--illegal", choices=("forfeit", "random"), default="forfeit")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="guardar el informe en un archivo JSON")
+    args = parser.parse_args(argv)
+
+    report = run_arena(args.games, args.workers, args.chunk, npz_path=args.npz, illegal=args.illegal, seed=args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""Benchmarks reproducibles del proyecto.
+
+    python benchmarks.py run --output bench.json
+    python benchmarks.py run --only minimax env --repeats 7
+    python benchmarks.py compare baseline.json bench.json --threshold 0.15
+
+Cada caso mide el tiempo por operación en varias repeticiones con semillas
+fijas y guarda mediana, mínimo y media. compare marca como regresión todo
+caso cuya mediana supere a la de la línea base en más del umbral y sale
+con código 1 si hay alguna. Los casos cuyas dependencias no están
+disponibles (TensorFlow, Qt) se guardan como omitidos con el motivo.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from tictactoe_core import AI, AI_MARKER, EMPTY_MARKER, PLAYER, PLAYER_MARKER, Board, GameRules, Minimax, TicTacToeEnv
+
+GROUPS = ("rules", "minimax", "env", "replay", "gui")
+
+# Posiciones estándar (casillas de O, casillas de X), X por mover
+STANDARD_POSITIONS = {
+    "empty": ((), ()),
+    "center_taken": ((4,), ()),
+    "corner_opening": ((0,), (4,)),
+    "midgame": ((0, 8), (4, 2)),
+    "forced_block": ((0, 1, 5), (4, 8))
+}
+
+
+class Skipped(Exception):
+    pass
+
+
+def measure(fn, number, repeats):
+    """Segundos por operación de fn() (que ejecuta number operaciones) en cada repetición."""
+    fn()  # calentamiento
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) / number)
+    return times
+
+
+def summarize(times, number):
+    median = statistics.median(times)
+    return {
+        "median": median,
+        "min": min(times),
+        "mean": statistics.fmean(times),
+        "ops_per_second": 1.0 / median if median else 0.0,
+        "number": number,
+        "repeats": len(times)
+    }
+
+
+def _board_from(cells):
+    player_cells, ai_cells = cells
+    board = Board()
+    for i in player_cells:
+        board.place(i, PLAYER)
+    for i in ai_cells:
+        board.place(i, AI)
+    return board
+
+
+def _random_boards(rng, count):
+    boards = []
+    for _ in range(count):
+        board = Board()
+        order = rng.sample(range(9), rng.randrange(10))
+        for turn, i in enumerate(order):
+            board.place(i, AI if turn % 2 == 0 else PLAYER)
+        boards.append(board)
+    return boards
+
+
+def bench_rules(seed, repeats, passes=20):
+    rng = random.Random(seed)
+    boards = _random_boards(rng, 1000)
+    lists = []
+    for board in boards:
+        markers = {AI: AI_MARKER, PLAYER: PLAYER_MARKER}
+        lists.append([markers.get(board.cell(i), EMPTY_MARKER) for i in range(9)])
+
+    def repeated(check, items):
+        def run():
+            for _ in range(passes):
+                for item in items:
+                    check(item)
+        return run
+
+    cases = {
+        "check_winner_board": repeated(lambda b: GameRules.check_winner(b, AI_MARKER, EMPTY_MARKER), boards),
+        "check_winner_list": repeated(lambda b: GameRules.check_winner(b, AI_MARKER, EMPTY_MARKER), lists),
+        "is_full_board": repeated(lambda b: GameRules.is_full(b, EMPTY_MARKER), boards),
+        "is_full_list": repeated(lambda b: GameRules.is_full(b, EMPTY_MARKER), lists)
+    }
+    number = passes * len(boards)
+    return {name: summarize(measure(fn, number, repeats), number) for name, fn in cases.items()}
+
+
+def bench_minimax(seed, repeats):
+    results = {}
+    for name, cells in STANDARD_POSITIONS.items():
+        board = _board_from(cells)
+        # En frío: tabla de transposición nueva en cada llamada
+        results[f"get_scores_{name}"] = summarize(measure(lambda: Minimax().get_scores(board), 1, repeats), 1)
+        warm = Minimax()
+        results[f"get_scores_{name}_warm"] = summarize(measure(lambda: warm.get_scores(board), 1, repeats), 1)
+        alphabeta = Minimax(search="alphabeta")
+        results[f"get_scores_{name}_alphabeta"] = summarize(measure(lambda: alphabeta.get_scores(board), 1, repeats), 1)
+    return results
+
+
+def bench_env(seed, repeats, steps=2000):
+    results = {}
+    for difficulty in ("random", "minimax"):
+        env = TicTacToeEnv()
+        env.difficulty = difficulty
+
+        def run():
+            random.seed(seed)
+            rng = random.Random(seed)
+            env.reset()
+            for _ in range(steps):
+                _, _, done = env.step(rng.choice(env.board.legal_moves()))
+                if done:
+                    env.reset()
+
+        results[f"step_{difficulty}"] = summarize(measure(run, steps, repeats), steps)
+    return results
+
+
+def bench_replay(seed, repeats, batch_sizes=(32, 64, 128), updates=20):
+    try:
+        from dqn_agent import DQNAgent
+    except ImportError as e:
+        raise Skipped(f"TensorFlow no disponible: {e}")
+    import tensorflow as tf
+
+    results = {}
+    for batch_size in batch_sizes:
+        np.random.seed(seed)
+        tf.random.set_seed(seed)
+        agent = DQNAgent(27, 9, memory_size=2000)
+        agent.memory.rng = np.random.default_rng(seed)
+        rng = np.random.default_rng(seed)
+        eye = np.eye(3, dtype=np.float32)
+        for _ in range(2000):
+            state = eye[rng.integers(0, 3, 9)].reshape(1, 27)
+            next_state = eye[rng.integers(0, 3, 9)].reshape(1, 27)
+            agent.remember(state, int(rng.integers(9)), float(rng.choice([-10, 0, 10])), next_state,
+                           bool(rng.integers(2)))
+        results[f"replay_batch_{batch_size}"] = summarize(
+            measure(lambda: agent.replay(batch_size, updates), updates, repeats), updates)
+    return results
+
+
+def bench_gui(seed, repeats, moves=20):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtWidgets import QApplication
+        import Tictactoe
+    except ImportError as e:
+        raise Skipped(f"Qt no disponible: {e}")
+
+    app = QApplication.instance() or QApplication([])
+    Tictactoe.model = Tictactoe.load_model()
+    Tictactoe.policy_table = Tictactoe.load_policy_table()
+    game = Tictactoe.TicTacToeGame(lambda: None, ai_delay_ms=0)
+
+    def wait_for(condition, timeout=5.0):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            if time.perf_counter() > deadline:
+                raise RuntimeError("La IA no respondió a tiempo")
+            app.processEvents()
+
+    def play():
+        # Jugadas del usuario al azar; se mide desde el clic hasta la jugada de la IA
+        rng = random.Random(seed)
+        played = 0
+        while played < moves:
+            game.game_mode = "ai"
+            game.reset_board()
+            game.turn = "user"
+            while not game.game_over and played < moves:
+                before = game.board.ai
+                game.handle_click(rng.choice(game.board.legal_moves()))
+                if game.game_over:
+                    break
+                wait_for(lambda: game.board.ai != before or game.game_over)
+                played += 1
+
+    try:
+        times = measure(play, moves, repeats)
+    finally:
+        game.stop_ai_thread()
+    engine = "policy_table" if Tictactoe.policy_table is not None else "model"
+    return {f"ai_move_{engine}": summarize(times, moves)}
+
+
+BENCHMARKS = {
+    "rules": bench_rules,
+    "minimax": bench_minimax,
+    "env": bench_env,
+    "replay": bench_replay,
+    "gui": bench_gui
+}
+
+
+def run(groups, seed=0, repeats=5):
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": seed,
+            "repeats": repeats,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": {},
+        "skipped": {}
+    }
+    for group in groups:
+        start = time.perf_counter()
+        try:
+            cases = BENCHMARKS[group](seed, repeats)
+        except Skipped as e:
+            report["skipped"][group] = str(e)
+            print(f"[{group}] omitido: {e}")
+            continue
+        for name, stats in cases.items():
+            report["results"][f"{group}.{name}"] = stats
+            print(f"[{group}] {name:32} {stats['median'] * 1e6:12.2f} us/op  ({stats['ops_per_second']:,.0f} op/s)")
+        print(f"[{group}] {time.perf_counter() - start:.1f}s")
+    return report
+
+
+def compare(baseline, current, threshold=0.10):
+    """Filas (caso, base, actual, cambio, estado) y si hubo alguna regresión."""
+    rows = []
+    regressed = False
+    for name, stats in sorted(current["results"].items()):
+        base = baseline["results"].get(name)
+        if base is None:
+            rows.append((name, None, stats["median"], None, "nuevo"))
+            continue
+        change = stats["median"] / base["median"] - 1.0
+        if change > threshold:
+            status, regressed = "REGRESIÓN", True
+        elif change < -threshold:
+            status = "mejora"
+        else:
+            status = "igual"
+        rows.append((name, base["median"], stats["median"], change, status))
+    for name in sorted(set(baseline["results"]) - set(current["results"])):
+        rows.append((name, baseline["results"][name]["median"], None, None, "ausente"))
+    return rows, regressed
+
+
+def print_comparison(rows, threshold):
+    print(f"{'caso':46} {'base us':>12} {'actual us':>12} {'cambio':>8}  estado (umbral {threshold:.0%})")
+    for name, base, current, change, status in rows:
+        base_text = f"{base * 1e6:12.2f}" if base is not None else f"{'-':>12}"
+        current_text = f"{current * 1e6:12.2f}" if current is not None else f"{'-':>12}"
+        change_text = f"{change:+8.1%}" if change is not None else f"{'-':>8}"
+        print(f"{name:46} {base_text} {current_text} {change_text}  {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de reglas, búsqueda, entorno, entrenamiento y GUI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="ejecuta los benchmarks y guarda un JSON")
+    run_parser.add_argument("--output", default="bench.json")
+    run_parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS))
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument("--baseline", default=None, help="compara al terminar con esta línea base")
+    run_parser.add_argument("--threshold", type=float, default=0.10)
+
+    compare_parser = sub.add_parser("compare", help="compara dos resultados y marca regresiones")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="aumento relativo de la mediana que cuenta como regresión")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        current = run(args.only, args.seed, args.repeats)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Resultados guardados en {args.output}")
+        if args.baseline is None:
+            return 0
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+
+    rows, regressed = compare(baseline, current, args.threshold)
+    print_comparison(rows, args.threshold)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+CHECKPOINT_PATH = "tictactoe_checkpoint.npz"
+VERSION = 1
+
+
+def _json_array(value):
+    return np.frombuffer(json.dumps(value).encode("utf-8"), dtype=np.uint8)
+
+
+def _optimizer_variables(agent):
+    optimizer = agent.model.optimizer
+    if not optimizer.built:
+        # Sin ningún paso de entrenamiento aún; se crean los momentos en cero
+        optimizer.build(agent.model.trainable_variables)
+    return optimizer.variables
+
+
+def save_checkpoint(agent, episode, path=CHECKPOINT_PATH):
+    """Guarda de forma atómica todo lo necesario para seguir entrenando.
+
+    Un solo .npz sin comprimir con pesos de la red (y de la objetivo),
+    variables del optimizador, la memoria de repetición en sus arreglos
+    binarios y un bloque JSON con epsilon, el episodio siguiente, los pasos
+    de entrenamiento y el estado de los generadores de random y NumPy. Se
+    escribe en un temporal y se renombra, así que un corte a mitad deja
+    intacto el checkpoint anterior.
+    """
+    arrays = {}
+    for i, weight in enumerate(agent.model.get_weights()):
+        arrays[f"model_{i}"] = weight
+    if agent.target_model is not None:
+        for i, weight in enumerate(agent.target_model.get_weights()):
+            arrays[f"target_{i}"] = weight
+    for i, variable in enumerate(_optimizer_variables(agent)):
+        arrays[f"optimizer_{i}"] = np.asarray(variable.numpy())
+
+    replay, replay_meta = agent.memory.to_arrays()
+    for key, value in replay.items():
+        arrays[f"replay_{key}"] = value
+
+    np_state = np.random.get_state()
+    arrays["numpy_keys"] = np_state[1]
+    meta = {
+        "version": VERSION,
+        "episode": episode,
+        "epsilon": agent.epsilon,
+        "train_steps": agent.train_steps,
+        "config": {
+            "state_size": agent.state_size,
+            "action_size": agent.action_size,
+            "target_update": agent.target_update,
+            "double_dqn": agent.double_dqn,
+            "masked": agent.masked
+        },
+        "replay": replay_meta,
+        "python_random": random.getstate(),
+        "numpy_random": [np_state[0], None, np_state[2], np_state[3], np_state[4]]
+    }
+    arrays["meta"] = _json_array(meta)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(agent, path=CHECKPOINT_PATH):
+    """Restaura en agent un checkpoint de save_checkpoint y devuelve el episodio por el que seguir."""
+    start = time.perf_counter()
+    with np.load(path) as data:
+        meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+        if meta["version"] != VERSION:
+            raise ValueError(f"Versión de checkpoint no soportada: {meta['version']}")
+        config = meta["config"]
+        current = {"state_size": agent.state_size, "action_size": agent.action_size,
+                   "target_update": agent.target_update, "double_dqn": agent.double_dqn, "masked": agent.masked}
+        if config != current:
+            raise ValueError(f"El checkpoint se guardó con otra configuración: {config}")
+
+        agent.model.set_weights([data[f"model_{i}"] for i in range(len(agent.model.weights))])
+        if agent.target_model is not None:
+            agent.target_model.set_weights([data[f"target_{i}"] for i in range(len(agent.target_model.weights))])
+        for i, variable in enumerate(_optimizer_variables(agent)):
+            variable.assign(data[f"optimizer_{i}"])
+
+        replay = {key[len("replay_"):]: data[key] for key in data.files if key.startswith("replay_")}
+        agent.memory.load_arrays(replay, meta["replay"])
+        numpy_keys = data["numpy_keys"]
+
+    agent.epsilon = meta["epsilon"]
+    agent.train_steps = meta["train_steps"]
+    python_state = meta["python_random"]
+    random.setstate((python_state[0], tuple(python_state[1]), python_state[2]))
+    numpy_state = meta["numpy_random"]
+    np.random.set_state((numpy_state[0], numpy_keys, *numpy_state[2:]))
+    print(f"Checkpoint {path} cargado en {time.perf_counter() - start:.2f}s "
+          f"(episodio {meta['episode']}, epsilon {agent.epsilon:.3f}, memoria {len(agent.memory)})")
+    return meta["episode"]
@@ -0,0 +1,97 @@
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from policy_table import ai_to_move_positions
+from tictactoe_core import Board, Minimax, onehot_batch
+
+# Objetivo para las casillas ocupadas: la recompensa de una jugada ilegal en TicTacToeEnv
+ILLEGAL_TARGET = -10.0
+
+
+def build_dataset(solver=None):
+    """Todas las posiciones alcanzables con X por mover, etiquetadas con Minimax.get_scores.
+
+    Devuelve los estados one-hot (N, 27), los puntajes por casilla como
+    objetivo (ILLEGAL_TARGET en las ocupadas) y la máscara de las jugadas
+    óptimas de cada posición.
+    """
+    solver = solver or Minimax()
+    positions = ai_to_move_positions()
+    ai = np.array([a for a, _ in positions], dtype=np.int64)
+    player = np.array([p for _, p in positions], dtype=np.int64)
+    states = onehot_batch(ai, player).astype(np.float32)
+
+    scores = np.array([solver.get_scores(Board(p, a)) for a, p in positions], dtype=np.float32)
+    legal = scores != -999
+    targets = np.where(legal, scores, ILLEGAL_TARGET).astype(np.float32)
+    optimal = legal & (scores == scores.max(axis=1, keepdims=True))
+    return states, targets, optimal
+
+
+def policy_rates(model, states, targets, optimal):
+    """Fracción de posiciones con jugada óptima, con jugada que conserva el resultado y jugadas ilegales.
+
+    Conservar el resultado es elegir una casilla libre cuyo puntaje tiene el
+    mismo signo que el mejor: ganar más lento o perder más rápido no tira
+    nada. Una casilla ocupada nunca lo conserva, aunque su objetivo sea
+    negativo como el de una posición perdida. El tercer valor es cuántas
+    posiciones eligen una casilla ocupada.
+    """
+    actions = np.argmax(model(states, training=False).numpy(), axis=1)
+    rows = np.arange(len(actions))
+    chosen = targets[rows, actions]
+    legal = chosen != ILLEGAL_TARGET
+    same_outcome = legal & (np.sign(chosen) == np.sign(targets.max(axis=1)))
+    return float(optimal[rows, actions].mean()), float(same_outcome.mean()), int((~legal).sum())
+
+
+def distill(model, states, targets, optimal, epochs=3000, batch_size=512, learning_rate=0.01,
+            check_every=250, seed=0):
+    """Ajusta model por MSE a los puntajes del solver en lotes grandes.
+
+    Todo el conjunto vive en el grafo y cada época es una sola llamada a una
+    tf.function con Adam propio y decaimiento coseno. Se detiene cuando la
+    red conserva el resultado en todas las posiciones (comprobado cada
+    check_every épocas) o al llegar a epochs.
+    """
+    start = time.perf_counter()
+    count = len(states)
+    steps = max(1, epochs * -(-count // batch_size))
+    optimizer = tf.keras.optimizers.Adam(tf.keras.optimizers.schedules.CosineDecay(learning_rate, steps))
+    all_states = tf.constant(states)
+    all_targets = tf.constant(targets)
+
+    @tf.function
+    def run_epoch(order):
+        loss = tf.constant(0.0)
+        for first in tf.range(0, count, batch_size):
+            indices = order[first:first + batch_size]
+            with tf.GradientTape() as tape:
+                q_values = model(tf.gather(all_states, indices), training=True)
+                loss = tf.reduce_mean(tf.square(q_values - tf.gather(all_targets, indices)))
+            gradients = tape.gradient(loss, model.trainable_variables)
+            optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+        return loss
+
+    rng = np.random.default_rng(seed)
+    loss, epoch = None, 0
+    optimal_share, outcome_share, illegal = policy_rates(model, states, targets, optimal)
+    for epoch in range(1, epochs + 1):
+        loss = float(run_epoch(tf.constant(rng.permutation(count))))
+        if epoch % check_every == 0 or epoch == epochs:
+            optimal_share, outcome_share, illegal = policy_rates(model, states, targets, optimal)
+            print(f"Épocas: {epoch}, MSE: {loss:.4f}, jugadas óptimas: {optimal_share:.2%}, "
+                  f"resultado conservado: {outcome_share:.2%}, jugadas ilegales: {illegal}")
+            if outcome_share == 1.0:
+                break
+    return {
+        "positions": count,
+        "epochs": epoch,
+        "seconds": time.perf_counter() - start,
+        "loss": loss,
+        "optimal_rate": optimal_share,
+        "outcome_rate": outcome_share,
+        "illegal_moves": illegal
+    }
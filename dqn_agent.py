@@ -0,0 +1,171 @@
+import random
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.layers import Dense
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.optimizers import Adam
+
+from replay_buffer import ReplayBuffer
+from tictactoe_core import EMPTY
+
+# Valor que reciben las acciones ilegales antes de maximizar; finito para que
+# multiplicado por (1 - done) en estados finales dé 0 y no NaN
+ILLEGAL_Q = -1e9
+
+
+class DQNAgent:
+    def __init__(self, st_size, ac_size, memory_size=2000, prioritized=False, target_update=0,
+                 double_dqn=False, masked=False):
+        self.state_size = st_size
+        self.action_size = ac_size
+        self.memory = ReplayBuffer(memory_size, st_size, prioritized=prioritized)
+        self.gamma = 0.95
+        self.epsilon = 1.0
+        self.epsilon_min = 0.01
+        self.epsilon_decay = 0.999
+        self.learning_rate = 0.001
+        self.model = self._build_model()
+
+        # target_update > 0 activa una red objetivo sincronizada cada N pasos de entrenamiento
+        self.target_update = target_update
+        self.double_dqn = double_dqn
+        # masked: explorar, elegir y maximizar los objetivos solo sobre casillas libres
+        self.masked = masked
+        self.target_model = None
+        self.train_steps = 0
+        self.last_td_error = None
+        # PhaseTimer opcional (training_metrics); con él, objetivo y ajuste se miden por separado
+        self.timer = None
+        self._compile_train_step()
+
+    def _build_model(self):
+        model = Sequential()
+        model.add(Dense(64, input_dim=self.state_size, activation='relu'))
+        model.add(Dense(64, activation='relu'))
+        model.add(Dense(self.action_size, activation='linear'))
+        model.compile(loss='mse', optimizer=Adam(learning_rate=self.learning_rate))
+        return model
+
+    @staticmethod
+    def legal_actions(state):
+        """Casillas libres según el canal vacío de la observación one-hot."""
+        return np.flatnonzero(np.reshape(state, -1)[EMPTY::3])
+
+    def act(self, current_state):
+        if np.random.rand() <= self.epsilon:
+            if self.masked:
+                return int(random.choice(self.legal_actions(current_state)))
+            return random.randrange(self.action_size)
+        if self.timer is None:
+            act_values = self.model.predict(current_state, verbose=0)
+        else:
+            with self.timer.phase("act"):
+                act_values = self.model.predict(current_state, verbose=0)
+        return self.greedy_action(current_state, act_values[0])
+
+    def greedy_action(self, current_state, q_values=None):
+        if q_values is None:
+            q_values = self.model(np.reshape(current_state, [1, self.state_size]), training=False).numpy()[0]
+        if self.masked:
+            legal = self.legal_actions(current_state)
+            return int(legal[np.argmax(q_values[legal])])
+        return np.argmax(q_values)
+
+    def remember(self, current_state, action, reward, next_state_val, is_done):
+        self.memory.add(current_state, action, reward, next_state_val, is_done)
+
+    def _compile_train_step(self):
+        if self.target_update:
+            self.target_model = self._build_model()
+            self.target_model.set_weights(self.model.get_weights())
+        self._train_step = tf.function(self._fused_train_step)
+        self._target_step = tf.function(self._target_values)
+        self._fit_step = tf.function(self._fit_targets)
+
+    def _targets(self, online_next, next_states, rewards, dones):
+        if self.target_model is None:
+            next_q_values = online_next
+        else:
+            next_q_values = self.target_model(next_states, training=False)
+
+        if self.masked:
+            legal = next_states[:, EMPTY::3] > 0.5
+            online_next = tf.where(legal, online_next, ILLEGAL_Q)
+            next_q_values = tf.where(legal, next_q_values, ILLEGAL_Q)
+
+        if self.double_dqn:
+            best_actions = tf.argmax(online_next, axis=1)
+            next_values = tf.gather(next_q_values, best_actions, batch_dims=1)
+        else:
+            next_values = tf.reduce_max(next_q_values, axis=1)
+        return rewards + self.gamma * next_values * (1.0 - dones)
+
+    def _loss(self, q_values, actions, targets, weights):
+        td_errors = targets - tf.gather(q_values, actions, batch_dims=1)
+        # Igual que el MSE de fit sobre las 9 salidas con las demás sin cambio
+        loss = tf.reduce_mean(weights * tf.square(td_errors)) / self.action_size
+        return loss, td_errors
+
+    def _apply_gradients(self, tape, loss):
+        gradients = tape.gradient(loss, self.model.trainable_variables)
+        self.model.optimizer.apply_gradients(zip(gradients, self.model.trainable_variables))
+
+    def _fused_train_step(self, states, actions, rewards, next_states, dones, weights):
+        batch = tf.shape(states)[0]
+        with tf.GradientTape() as tape:
+            # Q(s) y Q(s') en una sola pasada de la red
+            q_all = self.model(tf.concat([states, next_states], axis=0), training=True)
+            q_values = q_all[:batch]
+            targets = self._targets(tf.stop_gradient(q_all[batch:]), next_states, rewards, dones)
+            loss, td_errors = self._loss(q_values, actions, targets, weights)
+        self._apply_gradients(tape, loss)
+        return td_errors
+
+    def _target_values(self, next_states, rewards, dones):
+        return self._targets(self.model(next_states, training=False), next_states, rewards, dones)
+
+    def _fit_targets(self, states, actions, targets, weights):
+        with tf.GradientTape() as tape:
+            q_values = self.model(states, training=True)
+            loss, td_errors = self._loss(q_values, actions, targets, weights)
+        self._apply_gradients(tape, loss)
+        return td_errors
+
+    def _timed_train_step(self, states, actions, rewards, next_states, dones, weights):
+        # Mismo resultado que _fused_train_step, en dos pasos medibles
+        with self.timer.phase("target"):
+            targets = self._target_step(next_states, rewards, dones).numpy()
+        with self.timer.phase("fit"):
+            td_errors = self._fit_step(states, actions, targets, weights).numpy()
+        return td_errors
+
+    def replay(self, batch_size, updates=1):
+        if len(self.memory) < batch_size:
+            return
+        for _ in range(updates):
+            if self.timer is None:
+                states, actions, rewards, next_states, dones, indices, weights = self.memory.sample(batch_size)
+                td_errors = self._train_step(states, actions, rewards, next_states, dones.astype(np.float32),
+                                             weights).numpy()
+            else:
+                with self.timer.phase("sample"):
+                    states, actions, rewards, next_states, dones, indices, weights = self.memory.sample(batch_size)
+                td_errors = self._timed_train_step(states, actions, rewards, next_states, dones.astype(np.float32),
+                                                   weights)
+            self.memory.update_priorities(indices, td_errors)
+            self.last_td_error = float(np.mean(np.abs(td_errors)))
+
+            self.train_steps += 1
+            if self.target_model is not None and self.train_steps % self.target_update == 0:
+                self.target_model.set_weights(self.model.get_weights())
+
+        if self.epsilon > self.epsilon_min:
+            self.epsilon *= self.epsilon_decay
+
+    def save_model(self, name):
+        self.model.save(name)
+
+    def load_model(self, name):
+        self.model = tf.keras.models.load_model(name)
+        self._compile_train_step()
@@ -0,0 +1,279 @@
+"""Servidor TCP sin interfaz para partidas humano vs IA.
+
+Protocolo: un objeto JSON por línea en ambos sentidos.
+
+    -> {"type": "new", "first": "user" | "ai" | "random"}
+    -> {"type": "move", "cell": 0..8}
+    -> {"type": "quit"}
+    <- {"type": "state", "board": "X.O......", "ai_move": 4 | null, "result": null | "X" | "O" | "draw"}
+    <- {"type": "error", "message": "..."}
+
+El jugador humano es O y la IA es X, como en el cliente Qt.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from inference_service import BatchingInferenceService
+from numpy_inference import NPZ_PATH, NumpyPolicy
+from policy_table import POLICY_PATH, load_current_table
+from tictactoe_core import AI, PLAYER, Board
+
+SYMBOLS = {AI: "X", PLAYER: "O"}
+
+
+class GameSession:
+    __slots__ = ("board", "over")
+
+    def __init__(self):
+        self.board = None
+        self.over = True
+
+
+class TableEngine:
+    """Jugada de la red por consulta a la tabla precalculada (como el cliente Qt)."""
+
+    def __init__(self, table):
+        self.table = table
+
+    async def choose(self, board):
+        action = self.table.action(board)
+        if action < 0 or not board.is_empty(action):
+            action = random.choice(board.legal_moves())
+        return action
+
+
+class ModelEngine:
+    """Jugada de la red mediante el servicio de inferencia por lotes."""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def choose(self, board):
+        return await self.service.predict_async(board.to_onehot())
+
+
+def encode_board(board):
+    return "".join(SYMBOLS.get(board.cell(i), ".") for i in range(9))
+
+
+def game_result(board):
+    if board.has_won(AI):
+        return "X"
+    if board.has_won(PLAYER):
+        return "O"
+    if board.is_full():
+        return "draw"
+    return None
+
+
+class GameServer:
+    def __init__(self, engine):
+        self.engine = engine
+        self.connections = 0
+        self.moves = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        session = GameSession()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Línea más larga que el límite del stream: se avisa y se cierra
+                    writer.write(json.dumps({"type": "error", "message": "Mensaje demasiado largo"}).encode() + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    response = await self.dispatch(session, message)
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {"type": "error", "message": str(e)}
+                if response is None:
+                    break
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def dispatch(self, session, message):
+        kind = message["type"]
+        if kind == "quit":
+            return None
+        if kind == "new":
+            session.board = Board()
+            session.over = False
+            first = message.get("first", "random")
+            if first not in ("user", "ai", "random"):
+                raise ValueError(f"Valor de first inválido: {first}")
+            if first == "random":
+                first = random.choice(["user", "ai"])
+            ai_move = await self.ai_turn(session) if first == "ai" else None
+            return self.state(session, ai_move)
+        if kind == "move":
+            return await self.user_move(session, message["cell"])
+        raise ValueError(f"Tipo de mensaje desconocido: {kind}")
+
+    async def user_move(self, session, cell):
+        if session.over:
+            raise ValueError("No hay partida en curso")
+        # bool es subclase de int: true no debe jugar la casilla 1
+        if isinstance(cell, bool) or not isinstance(cell, int) or not 0 <= cell < 9 or not session.board.is_empty(cell):
+            raise ValueError(f"Casilla inválida: {cell}")
+
+        session.board.place(cell, PLAYER)
+        self.moves += 1
+        ai_move = None
+        if game_result(session.board) is None:
+            ai_move = await self.ai_turn(session)
+        return self.state(session, ai_move)
+
+    async def ai_turn(self, session):
+        action = await self.engine.choose(session.board)
+        session.board.place(action, AI)
+        return action
+
+    def state(self, session, ai_move):
+        result = game_result(session.board)
+        session.over = result is not None
+        return {"type": "state", "board": encode_board(session.board), "ai_move": ai_move, "result": result}
+
+
+def build_engine(kind, npz_path=NPZ_PATH, policy_path=POLICY_PATH):
+    if kind == "table":
+        table = load_current_table(policy_path, npz_path)
+        if table is not None:
+            return TableEngine(table), None
+        print("Se usa el motor model en su lugar")
+    service = BatchingInferenceService(NumpyPolicy.load(npz_path), mask_illegal=True).start()
+    return ModelEngine(service), service
+
+
+async def serve(host, port, engine):
+    server = GameServer(engine)
+    tcp_server = await asyncio.start_server(server.handle, host, port, limit=4096)
+    return server, tcp_server
+
+
+async def play_games(host, port, games, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def request(message):
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        return response
+
+    results = []
+    for _ in range(games):
+        state = await request({"type": "new"})
+        while state["result"] is None:
+            free = [i for i, c in enumerate(state["board"]) if c == "."]
+            state = await request({"type": "move", "cell": rng.choice(free)})
+        results.append(state["result"])
+    writer.write(b'{"type": "quit"}\n')
+    await writer.drain()
+    writer.close()
+    return results
+
+
+async def run_load(host, port, clients, games, seed=0):
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        play_games(host, port, games, latencies, random.Random(seed + i)) for i in range(clients)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    outcomes = [r for client in results for r in client]
+    return {
+        "clients": clients,
+        "games": len(outcomes),
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "moves_per_second": len(latencies) / elapsed,
+        "latency_p50_ms": float(np.percentile(latencies_ms, 50)),
+        "latency_p99_ms": float(np.percentile(latencies_ms, 99)),
+        "latency_p999_ms": float(np.percentile(latencies_ms, 99.9)),
+        "ai_wins": outcomes.count("X"),
+        "user_wins": outcomes.count("O"),
+        "draws": outcomes.count("draw")
+    }
+
+
+async def bench(args):
+    tcp_server = service = None
+    host, port = args.host, args.port
+    if not args.external:
+        engine, service = build_engine(args.engine)
+        _, tcp_server = await serve(host, 0, engine)
+        port = tcp_server.sockets[0].getsockname()[1]
+
+    try:
+        report = await run_load(host, port, args.clients, args.games)
+    finally:
+        if tcp_server is not None:
+            tcp_server.close()
+            await tcp_server.wait_closed()
+        if service is not None:
+            service.stop()
+
+    print(f"{report['clients']} clientes, {report['games']} partidas, {report['requests']} peticiones "
+          f"en {report['seconds']:.2f}s -> {report['moves_per_second']:.0f} jugadas/s")
+    print(f"Latencia p50 {report['latency_p50_ms']:.2f} ms, p99 {report['latency_p99_ms']:.2f} ms, "
+          f"p99.9 {report['latency_p999_ms']:.2f} ms")
+    print(f"Resultados: IA {report['ai_wins']}, jugador {report['user_wins']}, empates {report['draws']}")
+
+
+async def run_server(args):
+    engine, service = build_engine(args.engine)
+    server, tcp_server = await serve(args.host, args.port, engine)
+    print(f"Servidor escuchando en {args.host}:{args.port} (motor: {args.engine})")
+    try:
+        async with tcp_server:
+            await tcp_server.serve_forever()
+    finally:
+        if service is not None:
+            service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de TicTacToe con protocolo JSON por líneas")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="inicia el servidor")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--engine", choices=("table", "model"), default="table")
+
+    bench_parser = sub.add_parser("bench", help="generador de carga con clientes concurrentes")
+    bench_parser.add_argument("--host", default="127.0.0.1")
+    bench_parser.add_argument("--port", type=int, default=8765)
+    bench_parser.add_argument("--external", action="store_true",
+                              help="usar un servidor ya iniciado en lugar de uno en este proceso")
+    bench_parser.add_argument("--engine", choices=("table", "model"), default="table")
+    bench_parser.add_argument("--clients", type=int, default=1000)
+    bench_parser.add_argument("--games", type=int, default=5, help="partidas por cliente")
+
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_server(args) if args.command == "serve" else bench(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import asyncio
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from numpy_inference import NPZ_PATH, NumpyPolicy
+from tictactoe_core import EMPTY
+
+
+class BatchingInferenceService:
+    """Cola de inferencia que agrupa peticiones de muchos llamadores.
+
+    Cada llamador envía un estado one-hot y recibe un Future con la acción.
+    Un hilo despachador junta peticiones hasta max_batch_size o hasta que la
+    más antigua lleva max_wait_ms esperando, y hace una sola pasada de la red
+    por lote. Con mask_illegal=True el argmax solo considera casillas vacías.
+    """
+
+    def __init__(self, model, max_batch_size=64, max_wait_ms=2.0, mask_illegal=False, latency_window=10000):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.mask_illegal = mask_illegal
+
+        self.requests = queue.Queue()
+        self.thread = None
+        self.running = False
+
+        self.lock = threading.Lock()
+        self.batch_sizes = Counter()
+        self.latencies = deque(maxlen=latency_window)
+        self.total_requests = 0
+        self.total_batches = 0
+
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._dispatch_loop, name="inference-batcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, state):
+        future = Future()
+        self.requests.put((np.asarray(state, dtype=np.float32).ravel(), future, time.perf_counter()))
+        return future
+
+    def predict(self, state, timeout=None):
+        return self.submit(state).result(timeout)
+
+    async def predict_async(self, state):
+        return await asyncio.wrap_future(self.submit(state))
+
+    def _collect_batch(self):
+        try:
+            first = self.requests.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch_loop(self):
+        while self.running or not self.requests.empty():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            states = np.stack([state for state, _, _ in batch])
+            try:
+                q_values = np.asarray(self.model.predict(states, verbose=0))
+                if self.mask_illegal:
+                    empty = states.reshape(len(batch), -1, 3)[:, :, EMPTY] > 0
+                    q_values = np.where(empty, q_values, -np.inf)
+                actions = np.argmax(q_values, axis=1)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            for (_, future, started), action in zip(batch, actions):
+                future.set_result(int(action))
+            with self.lock:
+                self.batch_sizes[len(batch)] += 1
+                self.total_batches += 1
+                self.total_requests += len(batch)
+                self.latencies.extend(done - started for _, _, started in batch)
+
+    def metrics(self):
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000
+            histogram = dict(sorted(self.batch_sizes.items()))
+            requests, batches = self.total_requests, self.total_batches
+        return {
+            "queue_depth": self.requests.qsize(),
+            "requests": requests,
+            "batches": batches,
+            "mean_batch_size": requests / batches if batches else 0.0,
+            "batch_size_histogram": histogram,
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+            "latency_p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else 0.0
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de inferencia por lotes")
+    parser.add_argument("--npz", default=NPZ_PATH)
+    parser.add_argument("--callers", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=200, help="peticiones por llamador")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    model = NumpyPolicy.load(args.npz)
+    rng = np.random.default_rng(0)
+    states = np.eye(3, dtype=np.float32)[rng.integers(0, 3, (1024, 9))].reshape(1024, 27)
+
+    with BatchingInferenceService(model, args.max_batch_size, args.max_wait_ms) as service:
+        def caller(offset):
+            for i in range(args.requests):
+                service.predict(states[(offset + i) % len(states)])
+
+        threads = [threading.Thread(target=caller, args=(i,)) for i in range(args.callers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    metrics = service.metrics()
+    print(f"{metrics['requests']} peticiones en {elapsed:.2f}s ({metrics['requests'] / elapsed:.0f}/s)")
+    print(f"Lotes: {metrics['batches']}, tamaño medio {metrics['mean_batch_size']:.1f}")
+    print(f"Latencia p50 {metrics['latency_p50_ms']:.2f} ms, p99 {metrics['latency_p99_ms']:.2f} ms")
+    print(f"Histograma de tamaños de lote: {metrics['batch_size_histogram']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import argparse
+import hashlib
+import os
+import time
+
+import numpy as np
+
+from tictactoe_core import EMPTY, Board, reachable_positions
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+H5_PATH = os.path.join(BASE_DIR, "tictactoe_ia.h5")
+NPZ_PATH = os.path.join(BASE_DIR, "tictactoe_ia.npz")
+
+
+def model_paths(geometry=None):
+    """Rutas .h5 y .npz del modelo para un tablero.
+
+    3x3 usa las que carga el cliente; los demás tamaños llevan n y k en el
+    nombre para no pisarlas con una red de otra forma.
+    """
+    if geometry is None or geometry.is_standard:
+        return H5_PATH, NPZ_PATH
+    stem = os.path.join(BASE_DIR, f"tictactoe_ia_{geometry.n}x{geometry.n}_k{geometry.k}")
+    return f"{stem}.h5", f"{stem}.npz"
+
+ACTIVATIONS = {
+    "relu": lambda x: np.maximum(x, 0.0),
+    "linear": lambda x: x
+}
+
+
+def mlp_forward(weights, states, activations=None):
+    """Pasada hacia adelante de una pila de capas Dense.
+
+    Sin activations se asume la red de DQNAgent: relu en las ocultas y
+    lineal en la salida.
+    """
+    x = states
+    layers = len(weights) // 2
+    for layer in range(layers):
+        x = x @ weights[2 * layer] + weights[2 * layer + 1]
+        if activations is not None:
+            x = ACTIVATIONS[activations[layer]](x)
+        elif layer < layers - 1:
+            x = np.maximum(x, 0.0)
+    return x
+
+
+def weights_fingerprint(weights):
+    """SHA-256 de las formas y los valores en float32 de los pesos, en el orden de get_weights()."""
+    digest = hashlib.sha256()
+    for w in weights:
+        w = np.ascontiguousarray(w, dtype=np.float32)
+        digest.update(str(w.shape).encode())
+        digest.update(w.tobytes())
+    return digest.hexdigest()
+
+
+class NumpyPolicy:
+    """Red de la IA evaluada solo con NumPy, sin importar TensorFlow.
+
+    predict acepta los mismos argumentos que model.predict de Keras para
+    poder sustituirlo en el cliente. masked indica que la red se entrenó con
+    máscara de acciones legales (DQNAgent masked=True): sus valores en
+    casillas ocupadas no significan nada y greedy_actions las descarta.
+    """
+
+    def __init__(self, weights, activations, masked=False):
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.activations = list(activations)
+        self.masked = masked
+        self.state_size = self.weights[0].shape[0]
+        self.action_size = self.weights[-1].shape[0]
+
+    @classmethod
+    def load(cls, path=NPZ_PATH):
+        with np.load(path) as data:
+            layers = int(data["layers"])
+            weights = []
+            for layer in range(layers):
+                weights.append(data[f"kernel_{layer}"])
+                weights.append(data[f"bias_{layer}"])
+            activations = [str(a) for a in data["activations"]]
+            masked = bool(data["masked"]) if "masked" in data.files else False
+        return cls(weights, activations, masked)
+
+    def predict(self, states, verbose=0, batch_size=None):
+        states = np.asarray(states, dtype=np.float32).reshape(-1, self.state_size)
+        return mlp_forward(self.weights, states, self.activations)
+
+    def __call__(self, states):
+        return self.predict(states)
+
+
+def greedy_actions(model, states, masked=None):
+    """argmax de model.predict por fila; con máscara, solo entre casillas libres.
+
+    Sin masked explícito se usa el atributo masked del modelo (NumpyPolicy).
+    """
+    states = np.asarray(states, dtype=np.float32).reshape(len(states), -1)
+    q_values = np.asarray(model.predict(states, verbose=0, batch_size=max(1, len(states))))
+    if masked is None:
+        masked = getattr(model, "masked", False)
+    if masked:
+        q_values = np.where(states[:, EMPTY::3] > 0, q_values, -np.inf)
+    return np.argmax(q_values, axis=1)
+
+
+def export_model(model, npz_path=NPZ_PATH, masked=False):
+    arrays = {}
+    activations = []
+    for layer_index, layer in enumerate(model.layers):
+        kernel, bias = layer.get_weights()
+        arrays[f"kernel_{layer_index}"] = kernel.astype(np.float32)
+        arrays[f"bias_{layer_index}"] = bias.astype(np.float32)
+        activations.append(layer.get_config()["activation"])
+    np.savez(npz_path, layers=len(model.layers), activations=np.array(activations), masked=masked, **arrays)
+
+
+def export_weights(h5_path=H5_PATH, npz_path=NPZ_PATH):
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(h5_path, compile=False)
+    export_model(model, npz_path)
+    return model
+
+
+def check_parity(model, policy, samples=4096, seed=0):
+    """Compara Keras y NumPy sobre todos los tableros alcanzables y estados aleatorios."""
+    boards = reachable_positions()
+    reachable = np.array([Board(player, ai).to_onehot() for ai, player in boards], dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    random_states = rng.integers(0, 2, (samples, policy.state_size)).astype(np.float32)
+    states = np.concatenate([reachable, random_states])
+
+    expected = model.predict(states, verbose=0, batch_size=len(states))
+    actual = policy.predict(states)
+    return {
+        "states": len(states),
+        "max_abs_diff": float(np.max(np.abs(expected - actual))),
+        "argmax_agreement": float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1)))
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta la red de la IA a NumPy")
+    parser.add_argument("--h5", default=H5_PATH)
+    parser.add_argument("--npz", default=NPZ_PATH)
+    parser.add_argument("--check", action="store_true", help="verifica la paridad con Keras")
+    args = parser.parse_args(argv)
+
+    model = export_weights(args.h5, args.npz)
+    print(f"Pesos exportados a {args.npz} ({os.path.getsize(args.npz)} bytes)")
+
+    start = time.perf_counter()
+    policy = NumpyPolicy.load(args.npz)
+    print(f"Carga NumPy: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    if args.check:
+        report = check_parity(model, policy)
+        print(f"Paridad sobre {report['states']} estados: diferencia máxima {report['max_abs_diff']:.2e}, "
+              f"coincidencia de argmax {report['argmax_agreement'] * 100:.2f}%")
+
+        state = np.zeros((1, policy.state_size), dtype=np.float32)
+        runs = 10000
+        start = time.perf_counter()
+        for _ in range(runs):
+            policy.predict(state)
+        print(f"Inferencia NumPy: {(time.perf_counter() - start) / runs * 1e6:.1f} µs por jugada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import argparse
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tictactoe_core import AI_MARKER, PLAYER_MARKER, Geometry, Minimax, WIN_TABLE, _as_masks, new_board
+
+# Claves de canonical_key: 9 bits por bando más el turno
+SHARED_TABLE_SIZE = 1 << 19
+_EMPTY_SLOT = -128
+
+
+class SharedTranspositionTable:
+    """Tabla de transposición en memoria compartida entre procesos (solo 3x3).
+
+    Indexada directamente por canonical_key, un byte por posición; -128 es
+    "sin valor". Los valores son exactos y deterministas, así que dos
+    procesos que escriben la misma clave escriben lo mismo y no hace falta
+    bloqueo. Misma interfaz get/put que TranspositionTable.
+    """
+
+    def __init__(self, array):
+        self.array = array
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def allocate(ctx=mp):
+        array = ctx.RawArray("b", SHARED_TABLE_SIZE)
+        array[:] = [_EMPTY_SLOT] * SHARED_TABLE_SIZE
+        return array
+
+    def get(self, key):
+        value = self.array[key]
+        if value == _EMPTY_SLOT:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.array[key] = value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+_worker_solver = None
+
+
+def _init_worker(config, shared_array):
+    global _worker_solver
+    table = SharedTranspositionTable(shared_array) if shared_array is not None else None
+    _worker_solver = _make_solver(config, table)
+
+
+def _make_solver(config, table=None):
+    n, k, search, max_depth, use_table = config
+    geometry = Geometry(n, k)
+    return Minimax(table=table, use_table=use_table, search=search, geometry=geometry, max_depth=max_depth)
+
+
+def _subtree_value(solver, ai, player, last, depth, is_ai_turn):
+    # Valor exacto del nodo con la misma convención de profundidad que get_scores
+    if solver.generic:
+        return solver._grid_alphabeta(ai, player, last, depth, is_ai_turn, -1000, 1000)
+    if solver.search == "alphabeta":
+        return solver._alphabeta(ai, player, depth, is_ai_turn, -1000, 1000)
+    return solver._recursive_solve(ai, player, depth, is_ai_turn)
+
+
+def _ready():
+    return True
+
+
+def _solve_task(task):
+    ai, player, last, depth, is_ai_turn = task
+    _worker_solver.nodes = 0
+    value = _subtree_value(_worker_solver, ai, player, last, depth, is_ai_turn)
+    return value, _worker_solver.nodes
+
+
+class ParallelMinimax:
+    """get_scores de Minimax repartido entre un pool de procesos reutilizable.
+
+    Con split_depth=1 cada jugada raíz es una tarea; con split_depth=2 cada
+    respuesta del rival a cada jugada raíz es una tarea y la raíz toma el
+    mínimo de sus respuestas. Cada subárbol se busca con ventana completa,
+    así que los puntajes son idénticos a los de Minimax en serie. El corte
+    en dos niveles reparte mejor la carga entre muchos procesos, pero las
+    respuestas ya no se podan entre sí y se visitan más nodos. Con
+    shared_table=True (solo 3x3, búsqueda "full") los procesos comparten
+    una tabla de transposición en memoria compartida.
+    """
+
+    def __init__(self, workers=None, split_depth=1, shared_table=False, search="full",
+                 geometry=None, max_depth=None, use_table=True):
+        if split_depth not in (1, 2):
+            raise ValueError(f"split_depth debe ser 1 o 2: {split_depth}")
+        self.geometry = geometry or Geometry(3, 3)
+        self.workers = workers or os.cpu_count()
+        self.split_depth = split_depth
+        self.AI = AI_MARKER
+        self.PLAYER = PLAYER_MARKER
+
+        # El padre usa el mismo solver para los nodos terminales y para validar
+        self.config = (self.geometry.n, self.geometry.k, search, max_depth, use_table)
+        self.solver = _make_solver(self.config)
+        self.shared_array = None
+        if shared_table:
+            if self.solver.generic or self.solver.search != "full":
+                raise ValueError("La tabla compartida solo aplica a 3x3 con búsqueda full")
+            self.shared_array = SharedTranspositionTable.allocate(mp.get_context("spawn"))
+
+        self.pool = None
+        self.last_stats = None
+
+    def _get_pool(self):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"),
+                                            initializer=_init_worker, initargs=(self.config, self.shared_array))
+        return self.pool
+
+    def warm_up(self):
+        """Arranca todos los procesos del pool antes de la primera búsqueda."""
+        pool = self._get_pool()
+        for future in [pool.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _is_won(self, mask, last):
+        if self.solver.generic:
+            return self.geometry.wins_at(mask, last)
+        return WIN_TABLE[mask] == 1
+
+    def get_scores(self, board):
+        ai, player = _as_masks(board, self.AI, self.PLAYER)
+        start = time.perf_counter()
+        full = self.geometry.full_mask
+        cells = self.geometry.cells
+
+        scores = [-999] * cells
+        tasks, owners = [], []
+        for i in range(cells):
+            bit = 1 << i
+            if (ai | player) & bit:
+                continue
+            child_ai = ai | bit
+            terminal = self._is_won(child_ai, i) or (child_ai | player) == full
+            if self.split_depth == 1 or terminal:
+                if terminal:
+                    scores[i] = _subtree_value(self.solver, child_ai, player, i, 0, False)
+                else:
+                    tasks.append((child_ai, player, i, 0, False))
+                    owners.append(i)
+                continue
+            scores[i] = None
+            for j in range(cells):
+                if (child_ai | player) >> j & 1:
+                    continue
+                tasks.append((child_ai, player | 1 << j, j, 1, True))
+                owners.append(i)
+
+        nodes = 0
+        if tasks:
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            for i, (value, task_nodes) in zip(owners, self._get_pool().map(_solve_task, tasks, chunksize=chunksize)):
+                nodes += task_nodes
+                if self.split_depth == 1:
+                    scores[i] = value
+                else:
+                    # Turno del rival en el hijo: minimiza sobre sus respuestas
+                    scores[i] = value if scores[i] is None else min(scores[i], value)
+
+        self.last_stats = {
+            "search": f"parallel/{self.solver.search}",
+            "workers": self.workers,
+            "tasks": len(tasks),
+            "nodes": nodes,
+            "time": time.perf_counter() - start
+        }
+        return scores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aceleración de Minimax.get_scores en paralelo por número de procesos")
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--k", type=int, default=None)
+    parser.add_argument("--depth", type=int, default=6, help="profundidad máxima (solo tableros distintos de 3x3)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--split", type=int, choices=(1, 2), default=1)
+    parser.add_argument("--shared-table", action="store_true")
+    args = parser.parse_args(argv)
+
+    geometry = Geometry(args.size, args.k)
+    max_depth = None if geometry.is_standard else args.depth
+    board = new_board(geometry)
+
+    serial = Minimax(geometry=geometry, max_depth=max_depth)
+    start = time.perf_counter()
+    expected = serial.get_scores(board)
+    serial_time = time.perf_counter() - start
+    print(f"{args.size}x{args.size}, {geometry.k} en raya, profundidad {max_depth or 'completa'} "
+          f"(CPUs: {os.cpu_count()})")
+    print(f"  serie       {serial_time:8.3f}s  nodos {serial.last_stats['nodes']:9}")
+
+    for workers in args.workers:
+        with ParallelMinimax(workers, args.split, args.shared_table, geometry=geometry, max_depth=max_depth) as solver:
+            solver.warm_up()  # arranque de procesos fuera de la medida; tablas aún vacías
+            scores = solver.get_scores(board)
+            elapsed = solver.last_stats["time"]
+        status = "idénticos" if scores == expected else "DISTINTOS"
+        print(f"  {workers:2} procesos {elapsed:8.3f}s  nodos {solver.last_stats['nodes']:9}  "
+              f"aceleración {serial_time / elapsed:5.2f}x  puntajes {status}")
+
+
+if __name__ == "__main__":
+    main()
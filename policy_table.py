@@ -0,0 +1,126 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from numpy_inference import NPZ_PATH, NumpyPolicy, greedy_actions, weights_fingerprint
+from tictactoe_core import AI, BASE3, FULL_MASK, NUM_CODES, PLAYER, WIN_TABLE, Board, reachable_positions
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+POLICY_PATH = os.path.join(BASE_DIR, "tictactoe_policy.npy")
+
+
+def ai_to_move_positions():
+    """Posiciones alcanzables sin terminar en las que puede tocarle mover a la IA (X)."""
+    positions = []
+    for ai, player in sorted(reachable_positions()):
+        if WIN_TABLE[ai] or WIN_TABLE[player] or (ai | player) == FULL_MASK:
+            continue
+        # La IA mueve con igual número de fichas (si empezó) o con una menos (si empezó el jugador)
+        if bin(player).count("1") - bin(ai).count("1") in (0, 1):
+            positions.append((ai, player))
+    return positions
+
+
+def fingerprint_path(path):
+    return os.path.splitext(path)[0] + ".sha256"
+
+
+def _model_weights(model):
+    return model.weights if isinstance(model, NumpyPolicy) else model.get_weights()
+
+
+def build_policy_table(model, path=POLICY_PATH, masked=None):
+    """Evalúa la red sobre todas las posiciones en un solo lote y guarda su argmax.
+
+    La tabla se indexa con el código base 3 del tablero. Vale -1 en posiciones
+    no alcanzables y en las que el argmax crudo cae en una casilla ocupada
+    (ahí el cliente elige una casilla libre al azar, igual que antes). Con
+    masked (por defecto el del modelo) el argmax solo mira casillas libres.
+    Junto a la tabla se guarda la huella de los pesos con que se generó.
+    """
+    positions = ai_to_move_positions()
+    boards = [Board(player, ai) for ai, player in positions]
+    states = np.array([board.to_onehot() for board in boards], dtype=np.float32)
+    actions = greedy_actions(model, states, masked)
+
+    table = np.full(NUM_CODES, -1, dtype=np.int8)
+    illegal = []
+    for board, action in zip(boards, actions):
+        if board.is_empty(int(action)):
+            table[board.code()] = action
+        else:
+            illegal.append((board, int(action)))
+    np.save(path, table)
+    with open(fingerprint_path(path), "w", encoding="utf-8") as f:
+        f.write(weights_fingerprint(_model_weights(model)) + "\n")
+    return table, positions, illegal
+
+
+def load_current_table(path=POLICY_PATH, npz_path=NPZ_PATH):
+    """PolicyTable de path solo si se generó con los pesos de npz_path; si no, None.
+
+    Tras reentrenar, una tabla vieja seguiría jugando las jugadas de la red
+    anterior: se ignora con un aviso para que se use el modelo nuevo.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(fingerprint_path(path), encoding="utf-8") as f:
+            expected = f.read().strip()
+    except FileNotFoundError:
+        expected = None
+    if not os.path.exists(npz_path) or expected != weights_fingerprint(NumpyPolicy.load(npz_path).weights):
+        print(f"Aviso: {path} no corresponde a los pesos de {npz_path}; se ignora "
+              f"(regénerala con policy_table.py)")
+        return None
+    return PolicyTable(path)
+
+
+class PolicyTable:
+    """Tabla de jugadas de la red cargada como memmap de solo lectura."""
+
+    def __init__(self, path=POLICY_PATH):
+        self.table = np.load(path, mmap_mode="r")
+
+    def action(self, board):
+        return int(self.table[board.code()])
+
+    def actions(self, ai, player):
+        codes = np.take(BASE3, player) * PLAYER + np.take(BASE3, ai) * AI
+        return self.table[codes]
+
+
+def format_board(board):
+    symbols = {AI: "X", PLAYER: "O"}
+    cells = [symbols.get(board.cell(i), ".") for i in range(9)]
+    return "\n".join(" ".join(cells[row * 3:row * 3 + 3]) for row in range(3))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precalcula la jugada de la red para cada posición")
+    parser.add_argument("--npz", default=NPZ_PATH, help="pesos exportados con numpy_inference.py")
+    parser.add_argument("--h5", default=None, help="usar directamente un modelo Keras .h5")
+    parser.add_argument("--output", default=POLICY_PATH)
+    parser.add_argument("--show", type=int, default=5, help="ejemplos de jugadas ilegales a mostrar")
+    args = parser.parse_args(argv)
+
+    if args.h5:
+        import tensorflow as tf
+        model = tf.keras.models.load_model(args.h5, compile=False)
+    else:
+        model = NumpyPolicy.load(args.npz)
+
+    start = time.perf_counter()
+    table, positions, illegal = build_policy_table(model, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"Tabla de {table.nbytes} bytes con {len(positions)} posiciones en {elapsed * 1000:.1f} ms -> {args.output}")
+    print(f"Posiciones con argmax ilegal (el cliente juega al azar): {len(illegal)}")
+    for board, action in illegal[:args.show]:
+        print(f"\nargmax = {action}\n{format_board(board)}")
+
+
+if __name__ == "__main__":
+    main()
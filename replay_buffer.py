@@ -0,0 +1,204 @@
+import numpy as np
+
+
+class SumTree:
+    """Árbol de sumas sobre un arreglo plano para muestreo proporcional.
+
+    Las hojas viven en [size, 2 * size) y cada nodo interno guarda la suma
+    de sus dos hijos, así que tree[1] es la prioridad total.
+    """
+
+    def __init__(self, capacity):
+        self.size = 1
+        while self.size < capacity:
+            self.size *= 2
+        self.tree = np.zeros(2 * self.size, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, priorities):
+        nodes = np.asarray(indices, dtype=np.int64) + self.size
+        self.tree[nodes] = priorities
+        while nodes[0] > 1:
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def leaves(self, indices):
+        return self.tree[np.asarray(indices, dtype=np.int64) + self.size]
+
+    def find(self, values):
+        """Índices de las hojas cuya suma acumulada contiene cada valor."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.size:
+            left = self.tree[2 * nodes]
+            go_right = values > left
+            values -= left * go_right
+            nodes = 2 * nodes + go_right
+        return nodes - self.size
+
+
+class ReplayBuffer:
+    """Memoria circular de transiciones en arreglos de NumPy preasignados.
+
+    Los estados one-hot se guardan empaquetados a bits (27 casillas -> 4 bytes)
+    y acciones, recompensas y fines de episodio en columnas propias. Con
+    prioritized=True el muestreo es proporcional a |error TD|^alpha mediante
+    un SumTree, con pesos de importancia corregidos por beta.
+    """
+
+    def __init__(self, capacity, state_size, packed=True, prioritized=False, alpha=0.6, beta=0.4,
+                 beta_increment=1e-4, epsilon=1e-3, seed=None):
+        self.capacity = capacity
+        self.state_size = state_size
+        self.packed = packed
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+
+        width = (state_size + 7) // 8 if packed else state_size
+        self.states = np.zeros((capacity, width), dtype=np.uint8)
+        self.next_states = np.zeros((capacity, width), dtype=np.uint8)
+        self.actions = np.zeros(capacity, dtype=np.int16)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+
+        self.position = 0
+        self.size = 0
+        self.tree = SumTree(capacity) if prioritized else None
+        self.max_priority = 1.0
+
+    def __len__(self):
+        return self.size
+
+    def _encode(self, states):
+        states = np.asarray(states, dtype=np.uint8).reshape(-1, self.state_size)
+        return np.packbits(states, axis=1) if self.packed else states
+
+    def _decode(self, rows):
+        if self.packed:
+            rows = np.unpackbits(rows, axis=1, count=self.state_size)
+        return rows.astype(np.float32)
+
+    def add(self, state, action, reward, next_state, done):
+        i = self.position
+        self.states[i] = self._encode(state)[0]
+        self.next_states[i] = self._encode(next_state)[0]
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.dones[i] = done
+        if self.tree is not None:
+            self.tree.update([i], [self.max_priority])
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        count = len(actions)
+        if count > self.capacity:
+            states, next_states = states[-self.capacity:], next_states[-self.capacity:]
+            actions, rewards, dones = actions[-self.capacity:], rewards[-self.capacity:], dones[-self.capacity:]
+            count = self.capacity
+        indices = (self.position + np.arange(count)) % self.capacity
+        self.states[indices] = self._encode(states)
+        self.next_states[indices] = self._encode(next_states)
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.dones[indices] = dones
+        if self.tree is not None:
+            self.tree.update(indices, np.full(count, self.max_priority))
+
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size):
+        """Devuelve (states, actions, rewards, next_states, dones, indices, weights)."""
+        if self.tree is None:
+            indices = self.rng.integers(0, self.size, batch_size)
+            weights = np.ones(batch_size, dtype=np.float32)
+        else:
+            total = self.tree.total()
+            segment = total / batch_size
+            values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+            indices = np.minimum(self.tree.find(np.minimum(values, total * (1 - 1e-12))), self.size - 1)
+            probabilities = self.tree.leaves(indices) / total
+            weights = (self.size * probabilities) ** -self.beta
+            weights = (weights / weights.max()).astype(np.float32)
+            self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return (
+            self._decode(self.states[indices]),
+            self.actions[indices].astype(np.int64),
+            self.rewards[indices],
+            self._decode(self.next_states[indices]),
+            self.dones[indices],
+            indices,
+            weights
+        )
+
+    def update_priorities(self, indices, td_errors):
+        if self.tree is None:
+            return
+        priorities = (np.abs(td_errors) + self.epsilon) ** self.alpha
+        self.tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+    def to_arrays(self):
+        """Contenido y estado de muestreo como arreglos planos (para checkpoints, sin pickle).
+
+        Solo se guardan las size filas ocupadas, en formato empaquetado si
+        packed. meta lleva los escalares y el estado del generador.
+        """
+        size = self.size
+        arrays = {
+            "states": self.states[:size],
+            "next_states": self.next_states[:size],
+            "actions": self.actions[:size],
+            "rewards": self.rewards[:size],
+            "dones": self.dones[:size]
+        }
+        if self.tree is not None:
+            arrays["priorities"] = self.tree.leaves(np.arange(size))
+        meta = {
+            "capacity": self.capacity,
+            "state_size": self.state_size,
+            "packed": self.packed,
+            "prioritized": self.prioritized,
+            "position": self.position,
+            "size": size,
+            "max_priority": self.max_priority,
+            "beta": self.beta,
+            "rng": self.rng.bit_generator.state
+        }
+        return arrays, meta
+
+    def load_arrays(self, arrays, meta):
+        for key in ("capacity", "state_size", "packed", "prioritized"):
+            if meta[key] != getattr(self, key):
+                raise ValueError(f"La memoria guardada no es compatible: {key}={meta[key]}, "
+                                 f"esperado {getattr(self, key)}")
+        size = meta["size"]
+        self.states[:size] = arrays["states"]
+        self.next_states[:size] = arrays["next_states"]
+        self.actions[:size] = arrays["actions"]
+        self.rewards[:size] = arrays["rewards"]
+        self.dones[:size] = arrays["dones"]
+        if self.tree is not None:
+            self.tree.tree[:] = 0.0
+            if size:
+                self.tree.update(np.arange(size), arrays["priorities"])
+        self.position = meta["position"]
+        self.size = size
+        self.max_priority = meta["max_priority"]
+        self.beta = meta["beta"]
+        self.rng.bit_generator.state = meta["rng"]
+
+    def nbytes(self):
+        total = sum(a.nbytes for a in (self.states, self.next_states, self.actions, self.rewards, self.dones))
+        if self.tree is not None:
+            total += self.tree.tree.nbytes
+        return total
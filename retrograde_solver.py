@@ -0,0 +1,207 @@
+import argparse
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from tictactoe_core import AI, winning_lines
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def solved_path(n):
+    return os.path.join(BASE_DIR, f"tictactoe_solved_{n}x{n}.npy")
+
+
+class RetrogradeSolver:
+    """Análisis retrógrado de todo el espacio de estados n x n, k en raya.
+
+    Cada estado se indexa por su código base 3 (0 vacío, 1 = O, 2 = X) y se
+    guarda desde el punto de vista de X como jugador que mueve. Las
+    posiciones con O por mover se consultan intercambiando colores. Los
+    estados se resuelven por capas de número de fichas, de la más llena a la
+    vacía, y cada capa se procesa en bloques vectorizados:
+
+        valor(p) = max sobre casillas libres de -valor(intercambio(hijo))
+
+    La distancia es el número de jugadas hasta el final con juego óptimo:
+    el ganador acorta, el perdedor alarga, y en tablas se llena el tablero.
+    """
+
+    def __init__(self, n=3, k=None, chunk=1 << 18):
+        self.n = n
+        self.k = k or n
+        self.cells = n * n
+        self.size = 3 ** self.cells
+        self.chunk = chunk
+        self.lines = np.array(winning_lines(n, self.k), dtype=np.int64)
+        self.powers = 3 ** np.arange(self.cells, dtype=np.int64)
+
+    def _digits(self, codes):
+        digits = np.empty((len(codes), self.cells), dtype=np.int8)
+        rest = codes.copy()
+        for i in range(self.cells):
+            digits[:, i] = rest % 3
+            rest //= 3
+        return digits
+
+    def _layers(self):
+        # Capa = número de fichas; 255 marca estados imposibles con X por mover
+        layers = np.full(self.size, 255, dtype=np.uint8)
+        for start in range(0, self.size, self.chunk):
+            codes = np.arange(start, min(start + self.chunk, self.size), dtype=np.int64)
+            digits = self._digits(codes)
+            x_count = (digits == 2).sum(axis=1)
+            o_count = (digits == 1).sum(axis=1)
+            valid = (o_count == x_count) | (o_count == x_count + 1)
+            layers[start:start + len(codes)] = np.where(valid, x_count + o_count, 255)
+        return layers
+
+    def _solve_block(self, codes, values, distances):
+        digits = self._digits(codes)
+        on_lines = digits[:, self.lines]
+        x_line = (on_lines == 2).all(axis=2).any(axis=1)
+        o_line = (on_lines == 1).all(axis=2).any(axis=1)
+        empty = digits == 0
+        live = ~(x_line | o_line) & empty.any(axis=1)
+
+        # Terminales: ganó O (el último en mover) o tablero lleno; X con línea es inalcanzable
+        values[codes[o_line]] = -1
+        values[codes[x_line & ~o_line]] = 1
+        distances[codes[~live]] = 0
+        if not live.any():
+            return
+
+        codes, digits, empty = codes[live], digits[live], empty[live]
+        swapped = ((-digits) % 3).astype(np.int64) @ self.powers
+        children = np.where(empty, swapped[:, None] + self.powers[None, :], 0)
+        child_values = -values[children].astype(np.int32)
+        child_distances = distances[children].astype(np.int32) + 1
+
+        # Clave única para el max: ganar pronto > tablas > perder tarde
+        keys = np.where(child_values > 0, 1000 - child_distances,
+                        np.where(child_values < 0, child_distances - 1000, 0))
+        best = np.where(empty, keys, -(1 << 20)).max(axis=1)
+
+        values[codes] = np.sign(best)
+        distances[codes] = np.where(best > 0, 1000 - best, np.where(best < 0, best + 1000, empty.sum(axis=1)))
+
+    def build(self):
+        layers = self._layers()
+        values = np.zeros(self.size, dtype=np.int8)
+        distances = np.zeros(self.size, dtype=np.uint8)
+        for pieces in range(self.cells, -1, -1):
+            codes = np.flatnonzero(layers == pieces)
+            for start in range(0, len(codes), self.chunk):
+                self._solve_block(codes[start:start + self.chunk], values, distances)
+        return values, distances
+
+    def save(self, values, distances, path):
+        table = np.lib.format.open_memmap(path, mode="w+", dtype=np.int8, shape=(2, self.size))
+        table[0] = values
+        table[1] = distances.view(np.int8)
+        table.flush()
+
+
+class SolvedTable:
+    """Tabla resuelta abierta como memmap: valor y distancia en O(1) por consulta."""
+
+    def __init__(self, path):
+        table = np.load(path, mmap_mode="r")
+        self.values = table[0]
+        self.distances = table[1].view(np.uint8)
+        self.cells = round(math.log(len(self.values), 3))
+        self.powers = [3 ** i for i in range(self.cells)]
+
+    def swap_code(self, code):
+        swapped = 0
+        for power in self.powers:
+            digit = code // power % 3
+            swapped += (3 - digit) % 3 * power
+        return swapped
+
+    def lookup(self, code, x_to_move=True):
+        """(valor, distancia) para el jugador que mueve: 1 gana, 0 tablas, -1 pierde."""
+        if not x_to_move:
+            code = self.swap_code(code)
+        return int(self.values[code]), int(self.distances[code])
+
+    def best_move(self, board, channel=AI):
+        """Mejor casilla para channel en un Board 3x3 (o un código base 3 de X por mover)."""
+        code = board.code() if hasattr(board, "code") else board
+        if channel != AI:
+            code = self.swap_code(code)
+        swapped = self.swap_code(code)
+
+        best_key, best_cell = None, -1
+        for cell, power in enumerate(self.powers):
+            if code // power % 3:
+                continue
+            child = swapped + power
+            value, distance = -int(self.values[child]), int(self.distances[child]) + 1
+            key = 1000 - distance if value > 0 else distance - 1000 if value < 0 else 0
+            if best_key is None or key > best_key:
+                best_key, best_cell = key, cell
+        return best_cell
+
+
+_default_table = None
+
+
+def load_solved_table(path=None):
+    """Tabla 3x3 por defecto; si el archivo no existe se construye (tarda menos de un segundo)."""
+    global _default_table
+    if path is not None:
+        return SolvedTable(path)
+    if _default_table is None:
+        path = solved_path(3)
+        if not os.path.exists(path):
+            solver = RetrogradeSolver(3)
+            solver.save(*solver.build(), path)
+        _default_table = SolvedTable(path)
+    return _default_table
+
+
+def _max_rss_mib():
+    # resource solo existe en Unix; ru_maxrss viene en KiB en Linux y en bytes en macOS
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 2 ** 20 if sys.platform == "darwin" else max_rss / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solucionador retrógrado de n x n, k en raya")
+    parser.add_argument("--size", type=int, default=3, help="lado del tablero (3 o 4)")
+    parser.add_argument("--k", type=int, default=None, help="fichas en raya para ganar (por defecto el lado)")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--chunk", type=int, default=1 << 18)
+    args = parser.parse_args(argv)
+
+    output = args.output or solved_path(args.size)
+    solver = RetrogradeSolver(args.size, args.k, args.chunk)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    values, distances = solver.build()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    solver.save(values, distances, output)
+
+    value, distance = int(values[0]), int(distances[0])
+    outcome = {1: "gana el primero", 0: "tablas", -1: "gana el segundo"}[value]
+    print(f"{args.size}x{args.size}, {solver.k} en raya: {solver.size} estados en {elapsed:.2f}s -> {output}")
+    max_rss = _max_rss_mib()
+    rss = f" (RSS máximo {max_rss:.1f} MiB)" if max_rss is not None else ""
+    print(f"Memoria pico: {peak / 2 ** 20:.1f} MiB en NumPy{rss}")
+    print(f"Posición inicial: {outcome} en {distance} jugadas")
+
+
+if __name__ == "__main__":
+    main()
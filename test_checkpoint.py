@@ -0,0 +1,48 @@
+"""Reanudar desde un checkpoint debe dar el mismo entrenamiento que no cortarlo."""
+import random
+
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from AI_Minimax_Random_Retraining import train_serial  # noqa: E402
+from checkpoint import load_checkpoint  # noqa: E402
+from dqn_agent import DQNAgent  # noqa: E402
+from tictactoe_core import TicTacToeEnv  # noqa: E402
+
+EPISODES = 30
+CUT = 15
+
+
+def _setup():
+    tf.keras.utils.set_random_seed(1)
+    random.seed(1)
+    np.random.seed(1)
+    env = TicTacToeEnv(batch_dim=True)
+    agent = DQNAgent(27, 9, prioritized=True, target_update=10, double_dqn=True, masked=True)
+    agent.memory.rng = np.random.default_rng(3)
+    return env, agent
+
+
+def test_resume_is_bit_identical(tmp_path):
+    path = str(tmp_path / "checkpoint.npz")
+
+    env, agent = _setup()
+    train_serial(env, agent, EPISODES, 8, 2, log_every=0)
+    expected_weights, expected_epsilon = agent.model.get_weights(), agent.epsilon
+
+    env, agent = _setup()
+    train_serial(env, agent, CUT, 8, 2, log_every=0, checkpoint_every=CUT, checkpoint_path=path)
+
+    # Agente nuevo con otras semillas: todo lo necesario sale del checkpoint
+    tf.keras.utils.set_random_seed(99)
+    env = TicTacToeEnv(batch_dim=True)
+    agent = DQNAgent(27, 9, prioritized=True, target_update=10, double_dqn=True, masked=True)
+    start = load_checkpoint(agent, path)
+    assert start == CUT
+    train_serial(env, agent, EPISODES, 8, 2, log_every=0, start_episode=start)
+
+    assert agent.epsilon == expected_epsilon
+    for weight, expected in zip(agent.model.get_weights(), expected_weights):
+        np.testing.assert_array_equal(weight, expected)
@@ -0,0 +1,197 @@
+"""Regresión del núcleo de bitboards contra la implementación original en listas.
+
+Las funciones _baseline_* copian las reglas, Minimax y el entorno de la
+primera versión del proyecto (tableros como listas de marcadores one-hot).
+El Minimax de referencia solo añade memoización por (tablero, profundidad,
+turno), que no cambia sus puntajes y permite recorrer todas las posiciones
+alcanzables en poco tiempo.
+"""
+import random
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from tictactoe_core import (AI, AI_MARKER, EMPTY_MARKER, FULL_MASK, PLAYER, PLAYER_MARKER, WIN_TABLE, Board,
+                            GameRules, Minimax, TicTacToeEnv, TranspositionTable, reachable_positions)
+
+_LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+
+
+def _baseline_check_winner(board, marker, empty_marker):
+    for a, b, c in _LINES:
+        if board[a] == board[b] == board[c] == marker and board[a] != empty_marker:
+            return True
+    return False
+
+
+def _baseline_is_full(board, empty_marker):
+    return not any(tile == empty_marker for tile in board)
+
+
+@lru_cache(maxsize=None)
+def _baseline_solve(board, depth, is_ai_turn):
+    # board: tupla de "e", "p", "a"; misma recursión que el Minimax original
+    if _baseline_check_winner(board, "a", "e"):
+        return 10 - depth
+    if _baseline_check_winner(board, "p", "e"):
+        return -10 + depth
+    if _baseline_is_full(board, "e"):
+        return 0
+    mover = "a" if is_ai_turn else "p"
+    scores = [_baseline_solve(board[:i] + (mover,) + board[i + 1:], depth + 1, not is_ai_turn)
+              for i in range(9) if board[i] == "e"]
+    return max(scores) if is_ai_turn else min(scores)
+
+
+def _baseline_get_scores(board):
+    return [-999 if board[i] != "e" else _baseline_solve(board[:i] + ("a",) + board[i + 1:], 0, False)
+            for i in range(9)]
+
+
+def _as_tuple(ai, player):
+    return tuple("a" if ai >> i & 1 else "p" if player >> i & 1 else "e" for i in range(9))
+
+
+def _as_markers(ai, player):
+    return [list(AI_MARKER) if ai >> i & 1 else list(PLAYER_MARKER) if player >> i & 1 else list(EMPTY_MARKER)
+            for i in range(9)]
+
+
+class _BaselineEnv:
+    """TicTacToeEnv original: tablero en listas y rival Minimax con marcadores intercambiados."""
+
+    def __init__(self):
+        self.board = []
+        self.difficulty = "minimax"
+
+    def reset(self):
+        self.board = [list(EMPTY_MARKER) for _ in range(9)]
+        return np.array(self.board).flatten()
+
+    def _enemy_scores(self):
+        # El rival es Minimax con AI y PLAYER intercambiados
+        swapped = tuple("a" if c == PLAYER_MARKER else "p" if c == AI_MARKER else "e" for c in self.board)
+        return _baseline_get_scores(swapped)
+
+    def step(self, action):
+        if self.board[action] != EMPTY_MARKER:
+            return np.array(self.board).flatten(), -10, True
+        self.board[action] = list(AI_MARKER)
+        if _baseline_check_winner(self.board, AI_MARKER, EMPTY_MARKER):
+            return np.array(self.board).flatten(), 10, True
+        if _baseline_is_full(self.board, EMPTY_MARKER):
+            return np.array(self.board).flatten(), 0, True
+
+        if self.difficulty == "random":
+            possible_moves = [i for i, x in enumerate(self.board) if x == EMPTY_MARKER]
+            enemy_action = random.choice(possible_moves) if possible_moves else -1
+        else:
+            enemy_action = np.argmax(self._enemy_scores())
+        if enemy_action != -1:
+            self.board[enemy_action] = list(PLAYER_MARKER)
+
+        if _baseline_check_winner(self.board, PLAYER_MARKER, EMPTY_MARKER):
+            return np.array(self.board).flatten(), -10, True
+        if _baseline_is_full(self.board, EMPTY_MARKER):
+            return np.array(self.board).flatten(), 0, True
+        return np.array(self.board).flatten(), 0, False
+
+
+def _positions():
+    return sorted(reachable_positions())
+
+
+def _open_positions():
+    return [(ai, player) for ai, player in _positions()
+            if not WIN_TABLE[ai] and not WIN_TABLE[player] and (ai | player) != FULL_MASK]
+
+
+def test_rules_match_baseline():
+    for ai, player in _positions():
+        markers = _as_markers(ai, player)
+        board = Board(player, ai)
+        for marker, channel in ((AI_MARKER, AI), (PLAYER_MARKER, PLAYER)):
+            expected = _baseline_check_winner(markers, marker, EMPTY_MARKER)
+            assert GameRules.check_winner(markers, marker, EMPTY_MARKER) == expected
+            assert GameRules.check_winner(board, marker, EMPTY_MARKER) == expected
+            assert board.has_won(channel) == expected
+        assert GameRules.is_full(markers, EMPTY_MARKER) == _baseline_is_full(markers, EMPTY_MARKER)
+        assert board.is_full() == _baseline_is_full(markers, EMPTY_MARKER)
+        assert (board.to_onehot() == np.array(markers).flatten()).all()
+
+
+def test_get_scores_match_baseline():
+    solver = Minimax(use_table=False)
+    for ai, player in _open_positions():
+        assert solver.get_scores(Board(player, ai)) == _baseline_get_scores(_as_tuple(ai, player))
+
+
+def test_table_scores_match_baseline():
+    # Una instancia que se calienta a lo largo del recorrido y una tabla
+    # diminuta que desaloja entradas sin parar: ninguna debe cambiar puntajes
+    warm = Minimax()
+    tiny = Minimax(table=TranspositionTable(capacity=64))
+    for ai, player in _open_positions():
+        expected = _baseline_get_scores(_as_tuple(ai, player))
+        assert warm.get_scores(Board(player, ai)) == expected
+        assert tiny.get_scores(Board(player, ai)) == expected
+    assert warm.table.hits > 0
+    assert tiny.table.evictions > 0 and len(tiny.table) <= 64
+
+
+def test_alphabeta_scores_match_baseline():
+    solver = Minimax(search="alphabeta")
+    for ai, player in _open_positions():
+        assert solver.get_scores(Board(player, ai)) == _baseline_get_scores(_as_tuple(ai, player))
+    assert solver.totals["cutoffs"] > 0
+
+
+@pytest.mark.parametrize("difficulty", ["random", "minimax"])
+def test_env_trajectories_match_baseline(difficulty):
+    env, baseline = TicTacToeEnv(), _BaselineEnv()
+    env.difficulty = baseline.difficulty = difficulty
+    actions = random.Random(7)
+    for episode in range(150):
+        assert (env.reset() == baseline.reset()).all()
+        done = False
+        while not done:
+            # Acciones al azar sobre las 9 casillas: incluye jugadas ilegales
+            action = actions.randrange(9)
+            random.seed(episode * 31 + action)
+            state, reward, done = env.step(action)
+            random.seed(episode * 31 + action)
+            expected_state, expected_reward, expected_done = baseline.step(action)
+            assert (state == expected_state).all()
+            assert (reward, done) == (expected_reward, expected_done)
+
+
+@pytest.mark.parametrize("obs_dtype", [np.float32, np.uint8])
+@pytest.mark.parametrize("batch_dim", [False, True])
+def test_env_observations_follow_board(obs_dtype, batch_dim):
+    env = TicTacToeEnv(obs_dtype=obs_dtype, batch_dim=batch_dim)
+    env.difficulty = "random"
+    shape = (1, env.state_size) if batch_dim else (env.state_size,)
+    actions = random.Random(11)
+    random.seed(11)
+    for _ in range(50):
+        state = env.reset()
+        done = False
+        while not done:
+            before = np.array(state)
+            next_state, _, done = env.step(actions.randrange(9))
+            # La observación anterior sigue intacta y la nueva refleja el tablero
+            assert (state == before).all()
+            assert next_state.dtype == obs_dtype and next_state.shape == shape
+            assert not next_state.flags.writeable
+            assert (next_state.reshape(-1) == env.board.to_onehot()).all()
+            state = next_state
+
+
+def test_env_writes_observation_into_out():
+    env = TicTacToeEnv()
+    out = np.empty(env.state_size, dtype=np.float64)
+    assert env.reset(out=out) is out
+    assert (out == env.board.to_onehot()).all()
+    assert env.step(4, out=out)[0] is out
+    assert (out == env.board.to_onehot()).all()
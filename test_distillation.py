@@ -0,0 +1,43 @@
+"""policy_rates no debe contar una casilla ocupada como jugada que conserva el resultado."""
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from distillation import ILLEGAL_TARGET, build_dataset, policy_rates  # noqa: E402
+
+
+class _FixedModel:
+    def __init__(self, q_values):
+        self.q_values = q_values
+
+    def __call__(self, states, training=False):
+        return self
+
+    def numpy(self):
+        return self.q_values
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return build_dataset()
+
+
+def test_solver_policy_is_perfect(dataset):
+    states, targets, optimal = dataset
+    assert policy_rates(_FixedModel(targets), states, targets, optimal) == (1.0, 1.0, 0)
+
+
+def test_illegal_moves_never_keep_the_outcome(dataset):
+    states, targets, optimal = dataset
+    occupied = targets == ILLEGAL_TARGET
+    # Elige una casilla ocupada siempre que la haya, la mejor en el tablero vacío
+    q_values = np.where(occupied, 100.0, targets)
+    optimal_share, outcome_share, illegal = policy_rates(_FixedModel(q_values), states, targets, optimal)
+
+    has_occupied = occupied.any(axis=1)
+    assert illegal == int(has_occupied.sum())
+    assert outcome_share == pytest.approx(float((~has_occupied).mean()))
+    assert optimal_share == outcome_share
+    # Hay posiciones perdidas donde el signo de -10 coincidía con el del mejor puntaje
+    assert (has_occupied & (targets.max(axis=1) < 0)).any()
@@ -0,0 +1,36 @@
+"""ParallelMinimax debe devolver exactamente los puntajes de Minimax en serie."""
+import pytest
+
+from parallel_minimax import ParallelMinimax
+from tictactoe_core import AI, PLAYER, Geometry, Minimax, new_board
+
+
+def _board(moves, geometry=None):
+    board = new_board(geometry)
+    for i, cell in enumerate(moves):
+        board.place(cell, AI if i % 2 == 0 else PLAYER)
+    return board
+
+
+# Vacío, tras la primera jugada y una posición con amenazas de ambos lados
+POSITIONS = [(), (4,), (0, 4), (0, 4, 8, 2)]
+
+
+@pytest.mark.parametrize("split_depth", [1, 2])
+@pytest.mark.parametrize("search,shared_table", [("full", False), ("full", True), ("alphabeta", False)])
+def test_parallel_matches_serial(split_depth, search, shared_table):
+    serial = Minimax(search=search)
+    with ParallelMinimax(2, split_depth, shared_table, search=search) as solver:
+        for moves in POSITIONS:
+            board = _board(moves)
+            assert solver.get_scores(board) == serial.get_scores(board)
+
+
+@pytest.mark.parametrize("split_depth", [1, 2])
+def test_parallel_matches_serial_on_grid(split_depth):
+    geometry = Geometry(4)
+    serial = Minimax(geometry=geometry, max_depth=3)
+    with ParallelMinimax(2, split_depth, geometry=geometry, max_depth=3) as solver:
+        for moves in [(), (5,), (5, 6, 10)]:
+            board = _board(moves, geometry)
+            assert solver.get_scores(board) == serial.get_scores(board)
@@ -0,0 +1,112 @@
+"""Muestreo proporcional, anillo y serialización de ReplayBuffer."""
+import numpy as np
+import pytest
+
+from replay_buffer import ReplayBuffer
+
+STATE_SIZE = 27
+
+
+def _states(rng, count):
+    return np.eye(3, dtype=np.float32)[rng.integers(0, 3, (count, 9))].reshape(count, STATE_SIZE)
+
+
+def _fill(memory, count, rng, first_action=0):
+    states = _states(rng, count)
+    next_states = _states(rng, count)
+    for i in range(count):
+        memory.add(states[i:i + 1], first_action + i, float(i), next_states[i:i + 1], i % 3 == 0)
+    return states, next_states
+
+
+def test_prioritized_sampling_follows_priorities():
+    # capacity no potencia de 2: el SumTree tiene hojas de relleno que nunca deben salir
+    memory = ReplayBuffer(5, STATE_SIZE, prioritized=True, seed=0)
+    _fill(memory, 5, np.random.default_rng(0))
+    td_errors = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+    memory.update_priorities(np.arange(5), td_errors)
+    priorities = (np.abs(td_errors) + memory.epsilon) ** memory.alpha
+    expected = priorities / priorities.sum()
+
+    counts = np.zeros(5)
+    for _ in range(2000):
+        indices = memory.sample(10)[5]
+        counts += np.bincount(indices, minlength=5)
+    np.testing.assert_allclose(counts / counts.sum(), expected, atol=0.01)
+
+    # Pesos de importancia: (N * P(i))^-beta normalizados por el máximo
+    memory.beta = 0.5
+    memory.beta_increment = 0.0
+    _, _, _, _, _, indices, weights = memory.sample(64)
+    raw = (5 * expected[indices]) ** -0.5
+    np.testing.assert_allclose(weights, raw / raw.max(), rtol=1e-5)
+
+
+def test_uniform_sampling_covers_stored_rows():
+    memory = ReplayBuffer(8, STATE_SIZE, seed=1)
+    _fill(memory, 3, np.random.default_rng(1))
+    indices = np.concatenate([memory.sample(32)[5] for _ in range(20)])
+    assert set(indices) == {0, 1, 2}
+
+
+@pytest.mark.parametrize("packed", [True, False])
+def test_ring_keeps_last_transitions(packed):
+    rng = np.random.default_rng(2)
+    memory = ReplayBuffer(4, STATE_SIZE, packed=packed)
+    states, next_states = _fill(memory, 6, rng)
+    assert len(memory) == 4 and memory.position == 2
+    # Las filas 0 y 1 se sobrescribieron con las transiciones 4 y 5
+    order = [4, 5, 2, 3]
+    assert list(memory.actions) == order
+    assert (memory._decode(memory.states) == states[order]).all()
+    assert (memory._decode(memory.next_states) == next_states[order]).all()
+
+    # Un lote más grande que la memoria deja solo sus últimas capacity transiciones
+    count = 10
+    batch_states, batch_next = _states(rng, count), _states(rng, count)
+    memory.add_batch(batch_states, np.arange(100, 100 + count), np.arange(count, dtype=np.float32),
+                     batch_next, np.zeros(count, dtype=bool))
+    assert len(memory) == 4 and memory.position == 2
+    order = [8, 9, 6, 7]
+    assert list(memory.actions) == [100 + i for i in order]
+    assert list(memory.rewards) == order
+    assert (memory._decode(memory.states) == batch_states[order]).all()
+    assert (memory._decode(memory.next_states) == batch_next[order]).all()
+
+
+def test_add_batch_wraps_around():
+    memory = ReplayBuffer(4, STATE_SIZE, prioritized=True)
+    _fill(memory, 3, np.random.default_rng(3))
+    rng = np.random.default_rng(4)
+    memory.add_batch(_states(rng, 3), np.array([10, 11, 12]), np.zeros(3, dtype=np.float32),
+                     _states(rng, 3), np.zeros(3, dtype=bool))
+    assert list(memory.actions) == [11, 12, 2, 10]
+    assert len(memory) == 4 and memory.position == 2
+    # Las filas nuevas entran con la prioridad máxima vista
+    np.testing.assert_allclose(memory.tree.leaves([3, 0, 1]), memory.max_priority)
+
+
+@pytest.mark.parametrize("prioritized", [True, False])
+def test_arrays_round_trip(prioritized):
+    memory = ReplayBuffer(6, STATE_SIZE, prioritized=prioritized, seed=5)
+    _fill(memory, 8, np.random.default_rng(5))
+    memory.update_priorities(np.arange(6), np.linspace(0.5, 3.0, 6))
+    memory.sample(4)
+
+    arrays, meta = memory.to_arrays()
+    restored = ReplayBuffer(6, STATE_SIZE, prioritized=prioritized, seed=99)
+    restored.load_arrays({key: np.array(value) for key, value in arrays.items()}, meta)
+
+    assert (len(restored), restored.position, restored.beta) == (len(memory), memory.position, memory.beta)
+    assert restored.max_priority == memory.max_priority
+    if prioritized:
+        np.testing.assert_array_equal(restored.tree.tree, memory.tree.tree)
+    # Mismo contenido y mismo generador: las muestras siguientes coinciden
+    for expected, actual in zip(memory.sample(16), restored.sample(16)):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_load_arrays_rejects_other_shape():
+    arrays, meta = ReplayBuffer(6, STATE_SIZE).to_arrays()
+    with pytest.raises(ValueError):
+        ReplayBuffer(8, STATE_SIZE).load_arrays(arrays, meta)
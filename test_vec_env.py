@@ -0,0 +1,63 @@
+"""VecTicTacToeEnv debe repetir paso a paso lo que hacen N TicTacToeEnv en modo "minimax"."""
+import numpy as np
+
+from tictactoe_core import TicTacToeEnv
+from tictactoe_vec_env import VecTicTacToeEnv
+
+NUM_ENVS = 16
+
+
+def _singles():
+    envs = [TicTacToeEnv() for _ in range(NUM_ENVS)]
+    for env in envs:
+        env.difficulty = "minimax"
+    return envs
+
+
+def _step_singles(envs, actions):
+    results = [env.step(action) for env, action in zip(envs, actions)]
+    states = np.stack([state for state, _, _ in results])
+    rewards = np.array([reward for _, reward, _ in results])
+    dones = np.array([done for _, _, done in results])
+    return states, rewards, dones
+
+
+def test_vec_env_matches_single_envs():
+    vec = VecTicTacToeEnv(NUM_ENVS, auto_reset=False)
+    envs = _singles()
+    rng = np.random.default_rng(5)
+    assert (vec.reset() == np.stack([env.reset() for env in envs])).all()
+    for _ in range(300):
+        # Acciones al azar sobre las 9 casillas: incluye jugadas ilegales
+        actions = rng.integers(0, 9, NUM_ENVS)
+        states, rewards, dones = vec.step(actions)
+        expected_states, expected_rewards, expected_dones = _step_singles(envs, actions)
+        assert (states == expected_states).all()
+        assert (rewards == expected_rewards).all()
+        assert (dones == expected_dones).all()
+        if dones.any():
+            vec.reset(dones)
+            for i in np.flatnonzero(dones):
+                envs[i].reset()
+        assert (vec.observe() == np.stack([env.board.to_onehot() for env in envs])).all()
+
+
+def test_vec_env_auto_reset():
+    vec = VecTicTacToeEnv(NUM_ENVS)
+    envs = _singles()
+    vec.reset()
+    for env in envs:
+        env.reset()
+    rng = np.random.default_rng(6)
+    finished = 0
+    for _ in range(20):
+        actions = rng.integers(0, 9, NUM_ENVS)
+        states, rewards, dones = vec.step(actions)
+        expected_states, expected_rewards, expected_dones = _step_singles(envs, actions)
+        # step devuelve el estado terminal; observe() ya ve los tableros reiniciados
+        assert (states == expected_states).all()
+        assert (rewards == expected_rewards).all() and (dones == expected_dones).all()
+        resets = np.stack([envs[i].reset() if done else expected_states[i] for i, done in enumerate(dones)])
+        assert (vec.observe() == resets).all()
+        finished += int(dones.sum())
+    assert finished > 0
@@ -0,0 +1,766 @@
+import random
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Codificación one-hot de cada casilla (solo se usa en la frontera con la red)
+EMPTY_MARKER = [1, 0, 0]
+PLAYER_MARKER = [0, 1, 0]
+AI_MARKER = [0, 0, 1]
+
+# Canal de cada marcador dentro del one-hot
+EMPTY, PLAYER, AI = 0, 1, 2
+
+FULL_MASK = 0b111111111
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # filas
+    0b001001001, 0b010010010, 0b100100100,  # columnas
+    0b100010001, 0b001010100                # diagonales
+)
+
+
+def winning_lines(n, k):
+    """Casillas de cada línea de k en raya en un tablero n x n (filas, columnas y diagonales)."""
+    lines = []
+    for row in range(n):
+        for col in range(n):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + d_row * (k - 1), col + d_col * (k - 1)
+                if 0 <= end_row < n and 0 <= end_col < n:
+                    lines.append(tuple((row + d_row * j) * n + col + d_col * j for j in range(k)))
+    return lines
+
+
+# WIN_TABLE[mask] == 1 si la máscara contiene alguna línea ganadora
+WIN_TABLE = bytes(
+    any(mask & w == w for w in WIN_MASKS) for mask in range(FULL_MASK + 1)
+)
+
+# BITS[mask] es el vector de 9 casillas de una máscara
+BITS = ((np.arange(FULL_MASK + 1)[:, None] >> np.arange(9)) & 1).astype(np.int64)
+
+# BASE3[mask] = suma de 3^i sobre las casillas de la máscara; el código base 3
+# de un tablero es BASE3[player] * PLAYER + BASE3[ai] * AI
+BASE3 = tuple(sum(3 ** i for i in range(9) if mask >> i & 1) for mask in range(FULL_MASK + 1))
+NUM_CODES = 3 ** 9
+
+# Orden de exploración: centro, esquinas y luego bordes
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+# Las 8 simetrías del tablero como permutaciones de casillas (destino <- origen)
+SYMMETRIES = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),  # identidad
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),  # rotación 90
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),  # rotación 180
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),  # rotación 270
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),  # espejo horizontal
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),  # espejo vertical
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),  # diagonal principal
+    (8, 5, 2, 7, 4, 1, 6, 3, 0)   # diagonal secundaria
+)
+
+
+def _permute_mask(mask, perm):
+    return sum(1 << dst for dst, src in enumerate(perm) if mask >> src & 1)
+
+
+# SYM_TABLES[s][mask] es la máscara transformada por la simetría s
+SYM_TABLES = tuple(
+    tuple(_permute_mask(mask, perm) for mask in range(FULL_MASK + 1)) for perm in SYMMETRIES
+)
+
+
+def channel_of(marker):
+    return marker.index(1)
+
+
+def canonical_key(ai, player, is_ai_turn):
+    """Clave única de la posición bajo las 8 simetrías y el turno."""
+    key = min(table[ai] | table[player] << 9 for table in SYM_TABLES)
+    return key << 1 | is_ai_turn
+
+
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def onehot_batch(ai, player):
+    """Codificación one-hot (N, 27) de arreglos de máscaras ai / player."""
+    ai = np.asarray(ai)
+    player = np.asarray(player)
+    states = np.empty((len(ai), 9, 3), dtype=np.int64)
+    states[:, :, EMPTY] = BITS[FULL_MASK & ~(ai | player)]
+    states[:, :, PLAYER] = BITS[player]
+    states[:, :, AI] = BITS[ai]
+    return states.reshape(len(ai), 27)
+
+
+def reachable_positions(first_players=(AI, PLAYER)):
+    """Máscaras (ai, player) de todas las posiciones alcanzables en juego legal."""
+    seen = set()
+    positions = set()
+    pending = [(0, 0, first == AI) for first in first_players]
+    while pending:
+        ai, player, ai_turn = pending.pop()
+        if (ai, player, ai_turn) in seen:
+            continue
+        seen.add((ai, player, ai_turn))
+        positions.add((ai, player))
+        if WIN_TABLE[ai] or WIN_TABLE[player]:
+            continue
+        for i in iter_bits(FULL_MASK & ~(ai | player)):
+            if ai_turn:
+                pending.append((ai | 1 << i, player, False))
+            else:
+                pending.append((ai, player | 1 << i, True))
+    return positions
+
+
+class Board:
+    __slots__ = ("player", "ai")
+
+    def __init__(self, player=0, ai=0):
+        self.player = player
+        self.ai = ai
+
+    @classmethod
+    def from_onehot(cls, cells):
+        board = cls()
+        for i, cell in enumerate(cells):
+            channel = channel_of(list(cell))
+            if channel != EMPTY:
+                board.place(i, channel)
+        return board
+
+    def copy(self):
+        return Board(self.player, self.ai)
+
+    def mask(self, channel):
+        if channel == AI:
+            return self.ai
+        if channel == PLAYER:
+            return self.player
+        return self.empty_mask()
+
+    def empty_mask(self):
+        return FULL_MASK & ~(self.player | self.ai)
+
+    def cell(self, i):
+        bit = 1 << i
+        if self.ai & bit:
+            return AI
+        if self.player & bit:
+            return PLAYER
+        return EMPTY
+
+    def is_empty(self, i):
+        return not (self.player | self.ai) >> i & 1
+
+    def place(self, i, channel):
+        if channel == AI:
+            self.ai |= 1 << i
+        else:
+            self.player |= 1 << i
+
+    def has_won(self, channel):
+        return WIN_TABLE[self.mask(channel)] == 1
+
+    def is_full(self):
+        return (self.player | self.ai) == FULL_MASK
+
+    def code(self):
+        return BASE3[self.player] * PLAYER + BASE3[self.ai] * AI
+
+    def legal_moves(self):
+        return list(iter_bits(self.empty_mask()))
+
+    def to_onehot(self):
+        state = np.empty((9, 3), dtype=np.int64)
+        state[:, EMPTY] = BITS[self.empty_mask()]
+        state[:, PLAYER] = BITS[self.player]
+        state[:, AI] = BITS[self.ai]
+        return state.reshape(27)
+
+
+class Geometry:
+    """Tablero n x n con k en raya.
+
+    Precalcula las líneas ganadoras como máscaras de bits y, para cada
+    casilla, las líneas que pasan por ella: tras una jugada basta revisar
+    esas líneas (a lo sumo 4k) en lugar de todo el tablero.
+    """
+
+    def __init__(self, n=3, k=None):
+        self.n = n
+        self.k = k or n
+        if not 1 <= self.k <= n:
+            raise ValueError(f"k debe estar entre 1 y {n}: {self.k}")
+        self.cells = n * n
+        self.full_mask = (1 << self.cells) - 1
+        self.state_size = self.cells * 3
+        self.action_size = self.cells
+        self.line_masks = tuple(sum(1 << i for i in line) for line in winning_lines(n, self.k))
+        self.lines_through = tuple(
+            tuple(line for line in self.line_masks if line >> cell & 1) for cell in range(self.cells)
+        )
+        # Del centro hacia afuera, como MOVE_ORDER en 3x3
+        center = (n - 1) / 2
+        self.move_order = tuple(sorted(range(self.cells),
+                                       key=lambda i: (abs(i // n - center) + abs(i % n - center), i)))
+
+    @property
+    def is_standard(self):
+        return self.n == 3 and self.k == 3
+
+    def wins_at(self, mask, cell):
+        """True si alguna línea que pasa por cell está completa en mask."""
+        for line in self.lines_through[cell]:
+            if mask & line == line:
+                return True
+        return False
+
+    def has_line(self, mask):
+        for line in self.line_masks:
+            if mask & line == line:
+                return True
+        return False
+
+    def __eq__(self, other):
+        return isinstance(other, Geometry) and (self.n, self.k) == (other.n, other.k)
+
+    def __hash__(self):
+        return hash((self.n, self.k))
+
+    def __reduce__(self):
+        return Geometry, (self.n, self.k)
+
+
+STANDARD_GEOMETRY = Geometry(3, 3)
+Board.geometry = STANDARD_GEOMETRY
+
+
+class GridBoard(Board):
+    """Board de n x n casillas y k en raya.
+
+    Guarda el ganador al colocar cada ficha, revisando solo las líneas que
+    pasan por esa casilla; has_won es entonces O(1).
+    """
+
+    __slots__ = ("geometry", "winner")
+
+    def __init__(self, geometry, player=0, ai=0, winner=None):
+        super().__init__(player, ai)
+        self.geometry = geometry
+        if winner is None and (player or ai):
+            if geometry.has_line(ai):
+                winner = AI
+            elif geometry.has_line(player):
+                winner = PLAYER
+        self.winner = winner
+
+    @classmethod
+    def from_onehot(cls, cells, geometry=None):
+        cells = list(cells)
+        board = cls(geometry or Geometry(int(round(len(cells) ** 0.5))))
+        for i, cell in enumerate(cells):
+            channel = channel_of(list(cell))
+            if channel != EMPTY:
+                board.place(i, channel)
+        return board
+
+    def copy(self):
+        return GridBoard(self.geometry, self.player, self.ai, self.winner)
+
+    def empty_mask(self):
+        return self.geometry.full_mask & ~(self.player | self.ai)
+
+    def place(self, i, channel):
+        super().place(i, channel)
+        if self.winner is None and self.geometry.wins_at(self.mask(channel), i):
+            self.winner = channel
+
+    def has_won(self, channel):
+        return self.winner == channel
+
+    def is_full(self):
+        return (self.player | self.ai) == self.geometry.full_mask
+
+    def code(self):
+        code = 0
+        for i in iter_bits(self.player):
+            code += 3 ** i * PLAYER
+        for i in iter_bits(self.ai):
+            code += 3 ** i * AI
+        return code
+
+    def to_onehot(self):
+        state = np.zeros((self.geometry.cells, 3), dtype=np.int64)
+        state[list(iter_bits(self.player)), PLAYER] = 1
+        state[list(iter_bits(self.ai)), AI] = 1
+        state[:, EMPTY] = 1 - state[:, PLAYER] - state[:, AI]
+        return state.reshape(-1)
+
+
+def new_board(geometry=None):
+    """Tablero vacío: Board (tablas de 3x3) en el caso estándar, GridBoard si no."""
+    if geometry is None or geometry.is_standard:
+        return Board()
+    return GridBoard(geometry)
+
+
+def _as_masks(board, first_marker, second_marker):
+    """Devuelve las máscaras (primero, segundo) de un Board o de una lista one-hot."""
+    if isinstance(board, Board):
+        return board.mask(channel_of(first_marker)), board.mask(channel_of(second_marker))
+    first = second = 0
+    for i, cell in enumerate(board):
+        if cell == first_marker:
+            first |= 1 << i
+        elif cell == second_marker:
+            second |= 1 << i
+    return first, second
+
+
+class GameRules:
+    @staticmethod
+    def check_winner(board, marker, empty_marker, last_move=None, geometry=None):
+        """¿Tiene marker una línea completa?
+
+        Con last_move solo se revisan las líneas que pasan por esa casilla.
+        La geometría se toma del Board; para listas se deduce del tamaño
+        (k = n) salvo que se indique.
+        """
+        if marker == empty_marker:
+            return False
+        if isinstance(board, GridBoard) and last_move is None:
+            return board.has_won(channel_of(marker))
+        mask, _ = _as_masks(board, marker, empty_marker)
+        if geometry is None:
+            geometry = board.geometry if isinstance(board, Board) else _geometry_for(len(board))
+        if geometry.is_standard:
+            return WIN_TABLE[mask] == 1
+        if last_move is not None:
+            return geometry.wins_at(mask, last_move)
+        return geometry.has_line(mask)
+
+    @staticmethod
+    def is_full(board, empty_marker):
+        if isinstance(board, Board):
+            return board.is_full()
+        return not any(tile == empty_marker for tile in board)
+
+    @staticmethod
+    def is_winning_mask(mask, geometry=None):
+        if geometry is None or geometry.is_standard:
+            return WIN_TABLE[mask] == 1
+        return geometry.has_line(mask)
+
+
+def _geometry_for(cells):
+    n = int(round(cells ** 0.5))
+    return STANDARD_GEOMETRY if n == 3 else Geometry(n)
+
+
+class TranspositionTable:
+    """Caché LRU acotada de valores de Minimax, compartida entre episodios."""
+
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+def _at_depth(value, depth):
+    # Los valores se guardan como si el nodo fuera la raíz (profundidad 0);
+    # aquí se reaplica la convención 10 - depth / -10 + depth.
+    if value > 0:
+        return value - depth
+    if value < 0:
+        return value + depth
+    return 0
+
+
+class Minimax:
+    SEARCH_MODES = ("full", "alphabeta")
+
+    def __init__(self, table=None, use_table=True, search="full", geometry=None, max_depth=None):
+        if search not in self.SEARCH_MODES:
+            raise ValueError(f"Modo de búsqueda desconocido: {search}")
+        self.AI = AI_MARKER
+        self.PLAYER = PLAYER_MARKER
+        self.EMPTY = EMPTY_MARKER
+        # 3x3 usa las tablas precalculadas; otros tableros, alfa-beta con
+        # detección de victoria por la última jugada y profundidad opcional
+        self.geometry = geometry or STANDARD_GEOMETRY
+        self.generic = not self.geometry.is_standard
+        self.max_depth = max_depth
+        self.win_score = max(10, self.geometry.cells + 1)
+        if self.generic:
+            search, use_table = "alphabeta", False
+        if use_table and table is None and search == "full":
+            table = TranspositionTable()
+        self.table = table
+        self.search = search
+
+        self.nodes = 0
+        self.cutoffs = 0
+        self.last_stats = None
+        self.totals = {"calls": 0, "nodes": 0, "cutoffs": 0, "time": 0.0}
+
+    def get_scores(self, board):
+        ai, player = _as_masks(board, self.AI, self.PLAYER)
+        self.nodes = 0
+        self.cutoffs = 0
+        start = time.perf_counter()
+
+        scores = []
+        for i in range(self.geometry.cells):
+            bit = 1 << i
+            if (ai | player) & bit:
+                scores.append(-999)
+            elif self.generic:
+                scores.append(self._grid_alphabeta(ai | bit, player, i, 0, False, -1000, 1000))
+            elif self.search == "alphabeta":
+                scores.append(self._alphabeta(ai | bit, player, 0, False, -1000, 1000))
+            else:
+                scores.append(self._recursive_solve(ai | bit, player, depth=0, is_ai_turn=False))
+
+        self._record_stats(time.perf_counter() - start)
+        return scores
+
+    def evaluate(self, board, ai_to_move=True):
+        """Valor exacto de la posición para self.AI: > 0 gana, 0 empate, < 0 pierde."""
+        ai, player = _as_masks(board, self.AI, self.PLAYER)
+        if self.generic:
+            if self.geometry.has_line(ai):
+                return self.win_score
+            if self.geometry.has_line(player):
+                return -self.win_score
+            return self._grid_alphabeta(ai, player, -1, 0, ai_to_move, -1000, 1000)
+        return self._recursive_solve(ai, player, 0, ai_to_move)
+
+    def _record_stats(self, elapsed):
+        self.last_stats = {
+            "search": self.search,
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "time": elapsed
+        }
+        self.totals["calls"] += 1
+        self.totals["nodes"] += self.nodes
+        self.totals["cutoffs"] += self.cutoffs
+        self.totals["time"] += elapsed
+
+    def _alphabeta(self, ai, player, depth, is_ai_turn, alpha, beta):
+        # Sin caché: los valores con poda son cotas, no valores exactos
+        self.nodes += 1
+        if WIN_TABLE[ai]:
+            return 10 - depth
+        if WIN_TABLE[player]:
+            return -10 + depth
+        occupied = ai | player
+        if occupied == FULL_MASK:
+            return 0
+
+        if is_ai_turn:
+            best_score = -1000
+            for i in MOVE_ORDER:
+                if occupied >> i & 1:
+                    continue
+                score = self._alphabeta(ai | 1 << i, player, depth + 1, False, alpha, beta)
+                best_score = max(best_score, score)
+                alpha = max(alpha, best_score)
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    break
+            return best_score
+        else:
+            best_score = 1000
+            for i in MOVE_ORDER:
+                if occupied >> i & 1:
+                    continue
+                score = self._alphabeta(ai, player | 1 << i, depth + 1, True, alpha, beta)
+                best_score = min(best_score, score)
+                beta = min(beta, best_score)
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    break
+            return best_score
+
+    def _grid_alphabeta(self, ai, player, last, depth, is_ai_turn, alpha, beta):
+        # last es la casilla recién jugada por el que no mueve; solo sus líneas pueden ganar
+        self.nodes += 1
+        geometry = self.geometry
+        if last >= 0:
+            if is_ai_turn and geometry.wins_at(player, last):
+                return -self.win_score + depth
+            if not is_ai_turn and geometry.wins_at(ai, last):
+                return self.win_score - depth
+        occupied = ai | player
+        if occupied == geometry.full_mask:
+            return 0
+        if self.max_depth is not None and depth >= self.max_depth:
+            return 0
+
+        if is_ai_turn:
+            best_score = -1000
+            for i in geometry.move_order:
+                if occupied >> i & 1:
+                    continue
+                score = self._grid_alphabeta(ai | 1 << i, player, i, depth + 1, False, alpha, beta)
+                best_score = max(best_score, score)
+                alpha = max(alpha, best_score)
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    break
+            return best_score
+        else:
+            best_score = 1000
+            for i in geometry.move_order:
+                if occupied >> i & 1:
+                    continue
+                score = self._grid_alphabeta(ai, player | 1 << i, i, depth + 1, True, alpha, beta)
+                best_score = min(best_score, score)
+                beta = min(beta, best_score)
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    break
+            return best_score
+
+    def _recursive_solve(self, ai, player, depth, is_ai_turn):
+        self.nodes += 1
+        if self.table is None:
+            return _at_depth(self._solve_node(ai, player, is_ai_turn), depth)
+
+        key = canonical_key(ai, player, is_ai_turn)
+        value = self.table.get(key)
+        if value is None:
+            value = self._solve_node(ai, player, is_ai_turn)
+            self.table.put(key, value)
+        return _at_depth(value, depth)
+
+    def _solve_node(self, ai, player, is_ai_turn):
+        if WIN_TABLE[ai]:
+            return 10
+        if WIN_TABLE[player]:
+            return -10
+        empty = FULL_MASK & ~(ai | player)
+        if not empty:
+            return 0
+
+        if is_ai_turn:
+            best_score = -1000
+            for i in iter_bits(empty):
+                score = self._recursive_solve(ai | 1 << i, player, 1, False)
+                best_score = max(best_score, score)
+            return best_score
+        else:
+            best_score = 1000
+            for i in iter_bits(empty):
+                score = self._recursive_solve(ai, player | 1 << i, 1, True)
+                best_score = min(best_score, score)
+            return best_score
+
+    def cache_stats(self):
+        return self.table.stats() if self.table is not None else None
+
+
+class TicTacToeEnv:
+    def __init__(self, n=3, k=None, search_depth=None, search_budget_ms=50, mcts_playouts=None,
+                 obs_dtype=np.float32, batch_dim=False):
+        self.AI_MARKER = AI_MARKER
+        self.PLAYER_MARKER = PLAYER_MARKER
+        self.EMPTY_MARKER = EMPTY_MARKER
+
+        self.geometry = STANDARD_GEOMETRY if (n, k or n) == (3, 3) else Geometry(n, k)
+        self.state_size = self.geometry.state_size
+        self.action_size = self.geometry.action_size
+
+        self.board = new_board(self.geometry)
+        self.done = False
+        self.difficulty = "minimax"
+        self.solved_table = None
+
+        # Motores "iterative" y "mcts" (anytime_search), creados al usarse
+        self.search_budget_ms = search_budget_ms
+        self.mcts_playouts = mcts_playouts
+        self.search_engines = {}
+        # PhaseTimer opcional (training_metrics) para medir la jugada del rival
+        self.timer = None
+
+        # Fuera de 3x3 el rival busca a profundidad limitada (2 por defecto)
+        if search_depth is None and not self.geometry.is_standard:
+            search_depth = 2
+        self.enemy_brain = Minimax(geometry=self.geometry, max_depth=search_depth)
+        self.enemy_brain.AI = self.PLAYER_MARKER
+        self.enemy_brain.PLAYER = self.AI_MARKER
+
+        # Observación one-hot en dos búferes que se alternan en cada llamada:
+        # la devuelta sigue válida durante la llamada siguiente (state y
+        # next_state del bucle de entrenamiento). Se entregan vistas de solo
+        # lectura, con forma (1, state_size) si batch_dim, y solo se tocan
+        # las casillas que cambian.
+        self.obs_dtype = np.dtype(obs_dtype)
+        self.batch_dim = batch_dim
+        shape = (1, self.state_size) if batch_dim else (self.state_size,)
+        buffers = np.zeros((2,) + shape, dtype=self.obs_dtype)
+        self._obs_flat = [buffers[i].reshape(self.state_size) for i in range(2)]
+        self._obs_views = []
+        for buffer in buffers:
+            view = buffer.view()
+            view.flags.writeable = False
+            self._obs_views.append(view)
+        self._empty_obs = np.zeros(self.state_size, dtype=self.obs_dtype)
+        self._empty_obs[EMPTY::3] = 1
+        self._current = 0
+
+        self.reset()
+
+    def reset(self, out=None):
+        self.board = new_board(self.geometry)
+        self.done = False
+        self._current ^= 1
+        np.copyto(self._obs_flat[self._current], self._empty_obs)
+        return self._observation(out)
+
+    def _observation(self, out=None):
+        if out is None:
+            return self._obs_views[self._current]
+        np.copyto(out, self._obs_views[self._current], casting="unsafe")
+        return out
+
+    def _mark(self, i, channel):
+        obs = self._obs_flat[self._current]
+        obs[3 * i + EMPTY] = 0
+        obs[3 * i + channel] = 1
+
+    def step(self, action, out=None):
+        """Juega action y la respuesta del rival; con out copia ahí la observación."""
+        action = int(action)
+        previous = self._current
+        self._current ^= 1
+        np.copyto(self._obs_flat[self._current], self._obs_flat[previous])
+
+        if not self.board.is_empty(action):
+            return self._observation(out), -10, True
+
+        self.board.place(action, AI)
+        self._mark(action, AI)
+
+        if self.board.has_won(AI):
+            return self._observation(out), 10, True
+
+        if self.board.is_full():
+            return self._observation(out), 0, True
+
+        if self.timer is None:
+            enemy_action = self._opponent_action()
+        else:
+            with self.timer.phase("opponent"):
+                enemy_action = self._opponent_action()
+
+        if enemy_action != -1:
+            self.board.place(enemy_action, PLAYER)
+            self._mark(enemy_action, PLAYER)
+
+        if self.board.has_won(PLAYER):
+            return self._observation(out), -10, True
+
+        if self.board.is_full():
+            return self._observation(out), 0, True
+
+        return self._observation(out), 0, False
+
+    def _opponent_action(self):
+        if self.difficulty == "random":
+            possible_moves = self.board.legal_moves()
+            if possible_moves:
+                enemy_action = random.choice(possible_moves)
+            else:
+                enemy_action = -1
+        elif self.difficulty == "solver":
+            enemy_action = self._solved_table().best_move(self.board, PLAYER)
+        elif self.difficulty in ("iterative", "mcts"):
+            enemy_action = self._search_engine().best_move(self.board, PLAYER)
+        else:
+            scores = self.enemy_brain.get_scores(self.board)
+            enemy_action = int(np.argmax(scores))
+        return enemy_action
+
+    def _search_engine(self):
+        engine = self.search_engines.get(self.difficulty)
+        if engine is None:
+            from anytime_search import make_engine
+            engine = make_engine(self.difficulty, self.geometry, self.search_budget_ms, self.mcts_playouts)
+            self.search_engines[self.difficulty] = engine
+        return engine
+
+    def _solved_table(self):
+        # Tabla retrógrada en memmap: consulta O(1) por casilla libre
+        if self.solved_table is None:
+            from retrograde_solver import load_solved_table, solved_path
+            if self.geometry.is_standard:
+                self.solved_table = load_solved_table()
+            elif self.geometry.k == self.geometry.n:
+                self.solved_table = load_solved_table(solved_path(self.geometry.n))
+            else:
+                raise ValueError(f"No hay tabla resuelta para {self.geometry.n}x{self.geometry.n}, "
+                                 f"{self.geometry.k} en raya")
+        return self.solved_table
+
+
+def compare_search_modes(board, configs=None):
+    """Ejecuta get_scores con cada configuración y devuelve sus estadísticas."""
+    if configs is None:
+        configs = {
+            "full": {"use_table": False},
+            "full+tt": {},
+            "alphabeta": {"search": "alphabeta"}
+        }
+    results = {}
+    for name, kwargs in configs.items():
+        solver = Minimax(**kwargs)
+        scores = solver.get_scores(board)
+        results[name] = dict(solver.last_stats, scores=scores)
+    return results
@@ -0,0 +1,117 @@
+import numpy as np
+
+from tictactoe_core import AI_MARKER, BITS, FULL_MASK, PLAYER_MARKER, WIN_TABLE, Board, Minimax, iter_bits, onehot_batch
+
+WIN_ARRAY = np.frombuffer(WIN_TABLE, dtype=np.uint8).astype(bool)
+
+_opponent_table = None
+
+
+def build_opponent_table(solver=None):
+    """Tabla con la jugada del Minimax rival para cada posición alcanzable.
+
+    Se indexa con ai | player << 9 y vale -1 en posiciones no alcanzables.
+    Reproduce exactamente la elección de TicTacToeEnv en modo "minimax"
+    (np.argmax sobre get_scores, primer índice en caso de empate).
+    """
+    if solver is None:
+        solver = Minimax()
+        solver.AI = PLAYER_MARKER
+        solver.PLAYER = AI_MARKER
+
+    table = np.full(1 << 18, -1, dtype=np.int8)
+    pending = [(0, 0)]
+    seen = set()
+    while pending:
+        ai, player = pending.pop()
+        for i in iter_bits(FULL_MASK & ~(ai | player)):
+            next_ai = ai | 1 << i
+            if WIN_TABLE[next_ai] or (next_ai | player) == FULL_MASK:
+                continue
+            index = next_ai | player << 9
+            if index in seen:
+                continue
+            seen.add(index)
+            table[index] = np.argmax(solver.get_scores(Board(player, next_ai)))
+            for j in iter_bits(FULL_MASK & ~(next_ai | player)):
+                next_player = player | 1 << j
+                if not WIN_TABLE[next_player]:
+                    pending.append((next_ai, next_player))
+    return table
+
+
+def get_opponent_table():
+    global _opponent_table
+    if _opponent_table is None:
+        _opponent_table = build_opponent_table()
+    return _opponent_table
+
+
+class VecTicTacToeEnv:
+    """N tableros de TicTacToeEnv avanzando a la vez con operaciones de NumPy.
+
+    Las recompensas y la terminación son las de TicTacToeEnv.step: -10 por
+    casilla ocupada, 10 si gana el agente, -10 si gana el rival y 0 en empate.
+    Los tableros terminados se reinician solos tras cada step; step devuelve
+    el estado terminal y observe() el estado ya reiniciado.
+    """
+
+    def __init__(self, num_envs, difficulty="minimax", auto_reset=True, seed=None):
+        self.num_envs = num_envs
+        self.difficulty = difficulty
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+
+        self.ai = np.zeros(num_envs, dtype=np.int64)
+        self.player = np.zeros(num_envs, dtype=np.int64)
+        self.opponent_table = None
+
+    def reset(self, mask=None):
+        if mask is None:
+            self.ai[:] = 0
+            self.player[:] = 0
+        else:
+            self.ai[mask] = 0
+            self.player[mask] = 0
+        return self.observe()
+
+    def observe(self):
+        return onehot_batch(self.ai, self.player)
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        bits = np.left_shift(1, actions)
+        rewards = np.zeros(self.num_envs, dtype=np.int64)
+
+        dones = ((self.ai | self.player) & bits) != 0
+        rewards[dones] = -10
+
+        live = ~dones
+        self.ai[live] |= bits[live]
+        won = live & WIN_ARRAY[self.ai]
+        rewards[won] = 10
+        dones |= won | ((self.ai | self.player) == FULL_MASK)
+
+        moving = np.flatnonzero(~dones)
+        if len(moving):
+            enemy_actions = self._opponent_actions(moving)
+            self.player[moving] |= np.left_shift(1, enemy_actions)
+            lost = np.zeros(self.num_envs, dtype=bool)
+            lost[moving] = WIN_ARRAY[self.player[moving]]
+            rewards[lost] = -10
+            dones |= lost | ((self.ai | self.player) == FULL_MASK)
+
+        next_states = self.observe()
+        if self.auto_reset and dones.any():
+            self.reset(dones)
+        return next_states, rewards, dones
+
+    def _opponent_actions(self, idx):
+        if self.difficulty == "random":
+            weights = self.rng.random((len(idx), 9))
+            weights[BITS[self.ai[idx] | self.player[idx]] == 1] = -1.0
+            return np.argmax(weights, axis=1)
+
+        if self.opponent_table is None:
+            self.opponent_table = get_opponent_table()
+        return self.opponent_table[self.ai[idx] | self.player[idx] << 9].astype(np.int64)
@@ -0,0 +1,187 @@
+import cProfile
+import csv
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Fases medidas en el entrenamiento; "opponent" ocurre dentro de "env_step"
+PHASES = ("env_step", "opponent", "act", "sample", "target", "fit")
+
+
+class PhaseTimer:
+    """Acumula tiempo exclusivo por fase.
+
+    Las fases pueden anidarse: el tiempo de una fase interna se descuenta de
+    la externa, así que las participaciones de todas suman como mucho 1.
+    """
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name):
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            self.totals[name] += elapsed - children
+            self.counts[name] += 1
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def reset(self):
+        self.totals.clear()
+        self.counts.clear()
+
+
+class TrainingMetrics:
+    """Registro por ventanas de episodios en JSONL o CSV.
+
+    Cada every episodios escribe una fila con episodios/s, transiciones/s,
+    recompensa media, resultados, epsilon, error TD medio y, por fase, los
+    segundos y su participación en el tiempo de la ventana.
+    """
+
+    def __init__(self, path, every=10, fmt=None):
+        self.path = path
+        self.every = every
+        self.fmt = fmt or ("csv" if path.endswith(".csv") else "jsonl")
+        self.timer = PhaseTimer()
+        self.fields = (["episode", "elapsed", "episodes_per_second", "transitions_per_second", "mean_reward",
+                        "wins", "draws", "losses", "epsilon", "td_error"]
+                       + [f"time_{p}" for p in PHASES] + [f"share_{p}" for p in PHASES] + ["share_other"])
+
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer = None
+        if self.fmt == "csv":
+            self.writer = csv.DictWriter(self.file, fieldnames=self.fields)
+            self.writer.writeheader()
+
+        self.start = self.window_start = time.perf_counter()
+        self.episodes = 0
+        self._reset_window()
+
+    def _reset_window(self):
+        self.window_episodes = 0
+        self.window_transitions = 0
+        self.rewards = []
+        self.timer.reset()
+
+    def end_episode(self, total_reward, transitions, epsilon, td_error=None):
+        self.episodes += 1
+        self.window_episodes += 1
+        self.window_transitions += transitions
+        self.rewards.append(total_reward)
+        self.epsilon = epsilon
+        self.td_error = td_error
+        if self.window_episodes >= self.every:
+            self.flush()
+
+    def flush(self):
+        if not self.window_episodes:
+            return None
+        now = time.perf_counter()
+        window = now - self.window_start
+        row = {
+            "episode": self.episodes,
+            "elapsed": now - self.start,
+            "episodes_per_second": self.window_episodes / window,
+            "transitions_per_second": self.window_transitions / window,
+            "mean_reward": sum(self.rewards) / len(self.rewards),
+            "wins": sum(r > 0 for r in self.rewards),
+            "draws": sum(r == 0 for r in self.rewards),
+            "losses": sum(r < 0 for r in self.rewards),
+            "epsilon": self.epsilon,
+            "td_error": self.td_error
+        }
+        measured = 0.0
+        for phase in PHASES:
+            seconds = self.timer.totals.get(phase, 0.0)
+            measured += seconds
+            row[f"time_{phase}"] = seconds
+            row[f"share_{phase}"] = seconds / window
+        row["share_other"] = max(0.0, 1.0 - measured / window)
+
+        if self.writer is not None:
+            self.writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+        self.window_start = now
+        self._reset_window()
+        return row
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+class ProfileWindow:
+    """cProfile y/o tracemalloc solo entre los episodios start y end (sin incluir end).
+
+    Al cerrar la ventana guarda el perfil en prefix.prof y devuelve un
+    resumen con las funciones más costosas y las líneas que más memoria
+    retienen.
+    """
+
+    def __init__(self, start, end, prefix, profile=True, memory=False, top=15):
+        self.start = start
+        self.end = end
+        self.prefix = prefix
+        self.profile = cProfile.Profile() if profile else None
+        self.memory = memory
+        self.top = top
+        self.snapshot = None
+        self.active = False
+
+    def before_episode(self, episode):
+        if episode == self.start and not self.active:
+            self.active = True
+            if self.memory:
+                tracemalloc.start()
+                self.snapshot = tracemalloc.take_snapshot()
+            if self.profile is not None:
+                self.profile.enable()
+        elif episode == self.end and self.active:
+            self.stop()
+
+    def stop(self):
+        if not self.active:
+            return None
+        self.active = False
+        if self.profile is not None:
+            self.profile.disable()
+        if self.memory:
+            # Antes de formatear el perfil, para no contar sus propias asignaciones
+            diff = tracemalloc.take_snapshot().compare_to(self.snapshot, "lineno")
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        lines = [f"--- Perfil de los episodios {self.start} a {self.end - 1} ---"]
+        if self.profile is not None:
+            self.profile.dump_stats(self.prefix + ".prof")
+            out = io.StringIO()
+            pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(self.top)
+            lines.append(out.getvalue())
+        if self.memory:
+            lines.append(f"Memoria pico en la ventana: {peak / 2 ** 20:.1f} MiB")
+            lines.extend(str(stat) for stat in diff[:self.top])
+        report = "\n".join(lines)
+        print(report)
+        return report
+
+
+def parse_window(text):
+    """Convierte "100:200" en (100, 200)."""
+    start, end = text.split(":")
+    return int(start), int(end)
@@ -0,0 +1,156 @@
+import argparse
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from numpy_inference import NPZ_PATH, NumpyPolicy, greedy_actions
+from policy_table import POLICY_PATH, PolicyTable, format_board
+from tictactoe_core import FULL_MASK, WIN_TABLE, Board, Minimax, iter_bits, onehot_batch
+
+
+class ModelPolicy:
+    def __init__(self, model):
+        self.model = model
+
+    def actions(self, ai, player):
+        return greedy_actions(self.model, onehot_batch(ai, player))
+
+
+class TablePolicy:
+    def __init__(self, table):
+        self.table = table
+
+    def actions(self, ai, player):
+        return np.asarray(self.table.actions(ai, player), dtype=np.int64)
+
+
+class PolicyVerifier:
+    """Recorre todo el árbol de respuestas del rival contra una política fija.
+
+    La política juega X y el rival prueba todas sus jugadas. Cada nivel de
+    posiciones con X por mover se evalúa con una sola llamada en lote. Se
+    cuentan partidas (líneas) y posiciones distintas por resultado, además
+    de las posiciones en que la política tira una victoria o un empate según
+    Minimax y las posiciones donde elige una casilla ocupada.
+
+    Con fallback="forfeit" una jugada ilegal cierra la línea como derrota;
+    con "all" se exploran todas las casillas libres, como el azar del cliente.
+    """
+
+    def __init__(self, policy, fallback="forfeit", max_examples=3):
+        self.policy = policy
+        self.fallback = fallback
+        self.max_examples = max_examples
+        self.solver = Minimax()
+
+        self.lines = defaultdict(int)
+        self.positions = defaultdict(set)
+        self.examples = defaultdict(list)
+
+    def _record(self, category, ai, player, lines, action=None):
+        self.lines[category] += lines
+        if (ai, player) not in self.positions[category]:
+            self.positions[category].add((ai, player))
+            if len(self.examples[category]) < self.max_examples:
+                self.examples[category].append((Board(player, ai), action))
+
+    def run(self, policy_first=True):
+        if policy_first:
+            frontier = {(0, 0): 1}
+        else:
+            frontier = {(0, 1 << i): 1 for i in range(9)}
+
+        while frontier:
+            keys = list(frontier)
+            ai = np.array([k[0] for k in keys], dtype=np.int64)
+            player = np.array([k[1] for k in keys], dtype=np.int64)
+            actions = self.policy.actions(ai, player)
+
+            next_frontier = defaultdict(int)
+            for (ai, player), action in zip(keys, actions.tolist()):
+                lines = frontier[(ai, player)]
+                occupied = ai | player
+                if action < 0 or occupied >> action & 1:
+                    self._record("illegal", ai, player, lines, action)
+                    if self.fallback == "forfeit":
+                        self._record("loss", ai, player, lines, action)
+                        continue
+                    moves = list(iter_bits(FULL_MASK & ~occupied))
+                else:
+                    moves = [action]
+
+                before = self.solver.evaluate(Board(player, ai), ai_to_move=True)
+                for move in moves:
+                    new_ai = ai | 1 << move
+                    after = self.solver.evaluate(Board(player, new_ai), ai_to_move=False)
+                    if before > 0 >= after:
+                        self._record("throws_win", ai, player, lines, move)
+                    elif before == 0 > after:
+                        self._record("throws_draw", ai, player, lines, move)
+
+                    if WIN_TABLE[new_ai]:
+                        self._record("win", new_ai, player, lines)
+                        continue
+                    if (new_ai | player) == FULL_MASK:
+                        self._record("draw", new_ai, player, lines)
+                        continue
+                    for reply in iter_bits(FULL_MASK & ~(new_ai | player)):
+                        new_player = player | 1 << reply
+                        if WIN_TABLE[new_player]:
+                            self._record("loss", new_ai, new_player, lines)
+                        elif (new_ai | new_player) == FULL_MASK:
+                            self._record("draw", new_ai, new_player, lines)
+                        else:
+                            next_frontier[(new_ai, new_player)] += lines
+            frontier = next_frontier
+        return self
+
+    def report(self):
+        return {category: {"lines": self.lines[category], "positions": len(self.positions[category])}
+                for category in ("win", "draw", "loss", "illegal", "throws_win", "throws_draw")}
+
+
+def load_policy(args):
+    if args.table:
+        return TablePolicy(PolicyTable(args.table))
+    if args.h5:
+        import tensorflow as tf
+        return ModelPolicy(tf.keras.models.load_model(args.h5, compile=False))
+    return ModelPolicy(NumpyPolicy.load(args.npz))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verificación exhaustiva de la política contra juego perfecto")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--npz", default=NPZ_PATH)
+    source.add_argument("--h5", default=None)
+    source.add_argument("--table", nargs="?", const=POLICY_PATH, default=None)
+    parser.add_argument("--fallback", choices=("forfeit", "all"), default="forfeit")
+    parser.add_argument("--examples", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    policy = load_policy(args)
+    failed = False
+    for policy_first in (True, False):
+        start = time.perf_counter()
+        verifier = PolicyVerifier(policy, args.fallback, args.examples).run(policy_first)
+        elapsed = time.perf_counter() - start
+
+        label = "IA primero" if policy_first else "rival primero"
+        print(f"=== {label} ({elapsed:.2f}s) ===")
+        for category, counts in verifier.report().items():
+            print(f"  {category:12} líneas {counts['lines']:8}  posiciones {counts['positions']:6}")
+        for category in ("loss", "illegal", "throws_win", "throws_draw"):
+            for board, action in verifier.examples[category]:
+                move = f" (jugada {action})" if action is not None else ""
+                print(f"\n  [{category}]{move}\n" + "\n".join("    " + row for row in format_board(board).split("\n")))
+        print()
+        failed |= bool(verifier.lines["loss"] or verifier.lines["illegal"])
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())